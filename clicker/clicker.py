@@ -1,45 +1,99 @@
-import json
 import random
+from collections import deque
+from kivy.animation import Animation
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.label import Label
-from kivy.clock import Clock
 from kivy.uix.floatlayout import FloatLayout
 
-player = {
-    "score": 0,
-    "power": 1
-}
+from economy import Economy, GENERATORS, UPGRADES
+from persistence import PlayerStore
 
-def read_data():
-    global player
-    try:
-        with open("play.json", "r", encoding="utf-8") as file:
-            player = json.load(file)
-    except:
-        print("невдача((((")
+# Як часто (разів на секунду) нараховується пасивний дохід і оновлюється рахунок
+UI_REFRESH_RATE = 4
 
-read_data()
+# player - стан гри в пам'яті (джерело правди); play.json оновлюється у фоні
+store = PlayerStore("play.json", {
+    "score": 0,
+    "power": 1
+})
+player = store.load()
+economy = Economy(player)
 
 def save_data():
-    global player
-    try:
-        with open("play.json", "w", encoding="utf-8") as file:
-            json.dump(player, file, indent=4, ensure_ascii=True)
-    except:
-        print("невдача((((")
+    # Без запису на кожен клік: файл запишеться у фоні, коли кліки вщухнуть
+    store.save()
+
+class PowerPopups:
+    """Фіксований набір написів "+сила", які перевикористовуються
+
+    Написи створюються один раз і весь час лишаються на екрані (вільні -
+    прозорі). Кожен клік бере вільний напис, або, якщо всі зайняті,
+    найстаріший, і запускає для нього анімацію підйому та згасання. Тож
+    кількість віджетів не залежить від швидкості кліків, а текстура
+    перемальовується лише коли змінюється текст (тобто сила кліку).
+    """
+
+    def __init__(self, parent, size=15, duration=2, rise=60):
+        self.duration = duration
+        self.rise = rise
+        self.free = deque()
+        self.active = deque()  # від найстарішого до найновішого
+        for _ in range(size):
+            label = Label(size_hint=(None, None), size=(200, 50), opacity=0)
+            parent.add_widget(label)
+            self.free.append(label)
+
+    def show(self, text, x, y):
+        if self.free:
+            label = self.free.popleft()
+        else:
+            # Всі зайняті - перевикористовуємо найстаріший (cancel не викликає on_complete)
+            label = self.active.popleft()
+            Animation.cancel_all(label)
+        if label.text != text:
+            label.text = text
+        label.pos = (x, y)
+        label.opacity = 1
+        self.active.append(label)
+
+        animation = Animation(y=y + self.rise, opacity=0, duration=self.duration)
+        animation.bind(on_complete=self._release)
+        animation.start(label)
+
+    def _release(self, animation, label):
+        self.active.remove(label)
+        self.free.append(label)
 
 class MainScreen(Screen):
     def __init__(self, **kw):
         super().__init__(**kw)
+        self.popups = PowerPopups(self)
 
     def on_shop_screen(self, *args):
         self.manager.current = "shop"
 
+    def on_enter(self, *args):
+        self.refresh_score()
+        app = App.get_running_app()
+        if app.offline_earned:
+            # Дохід, нарахований поки гра була закрита
+            self.popups.show(f"+ {app.offline_earned}", self.width / 2 - 100, self.height / 2)
+            app.offline_earned = 0
+
+    def refresh_score(self):
+        text = "рахунок: " + str(player["score"])
+        rate = economy.rate()
+        if rate:
+            text += f" (+{rate:g}/с)"
+        # Текстура перемальовується лише коли текст справді змінився
+        if self.ids.score_lbl.text != text:
+            self.ids.score_lbl.text = text
+
     def click(self):
-        read_data()
         player["score"] += player["power"]
-        self.ids.score_lbl.text = "рахунок: " + str(player["score"])
+        self.refresh_score()
         self.ids.click.size_hint = (1, 1)
         save_data()
         
@@ -51,25 +105,12 @@ class MainScreen(Screen):
         self.ids.click.source = "click.png"
 
     def show_power(self):
-        # Створюємо новий Label для відображення сили кліку
-        power_label = Label(
-            text=f"+ {player['power']}",
-            size_hint=(None, None),
-            size=(200, 50)
-        )
-        
         # Генеруємо випадкові координати
         x = random.uniform(0, self.width - 200)
         y = random.uniform(0, self.height - 50)
-        
-        # Встановлюємо позицію
-        power_label.pos = (x, y)
-        
-        # Додаємо Label до екрану
-        self.add_widget(power_label)
 
-        # Запускаємо таймер для видалення Label через 2 секунди
-        Clock.schedule_once(lambda dt: self.remove_widget(power_label), 2)
+        # Напис з пулу (новий віджет не створюється)
+        self.popups.show(f"+ {player['power']}", x, y)
 
 class SecondScreen(Screen):
     def __init__(self, **kw):
@@ -90,21 +131,54 @@ class ShopScreen(Screen):
         super().__init__(**kw)
 
     def on_enter(self, *args):
-        self.ids.money.text = "Рахунок: " + str(player["score"])
+        self.refresh_score()
+
+    def refresh_score(self):
+        text = "Рахунок: " + str(player["score"])
+        if self.ids.money.text != text:
+            self.ids.money.text = text
+        for generator in GENERATORS:
+            name = f"{generator.name} x{economy.count(generator.id)} (+{generator.rate}/с)"
+            cost = str(economy.cost(generator.id))
+            if self.ids["gen_" + generator.id].text != name:
+                self.ids["gen_" + generator.id].text = name
+            if self.ids["gen_" + generator.id + "_cost"].text != cost:
+                self.ids["gen_" + generator.id + "_cost"].text = cost
+        for upgrade in UPGRADES:
+            cost = "куплено" if economy.owns(upgrade.id) else str(upgrade.cost)
+            if self.ids["upgrade_" + upgrade.id + "_cost"].text != cost:
+                self.ids["upgrade_" + upgrade.id + "_cost"].text = cost
 
     def buy(self, price, power):
-        read_data()
+        economy.settle()
         if price <= player["score"]:
             player["score"] -= price
             player["power"] += power
-            self.ids.money.text = "Рахунок: " + str(player["score"])
+            self.refresh_score()
+            save_data()
+
+    def buy_generator(self, generator_id):
+        if economy.buy(generator_id):
+            self.refresh_score()
+            save_data()
+
+    def buy_upgrade(self, upgrade_id):
+        if economy.buy_upgrade(upgrade_id):
+            self.refresh_score()
             save_data()
 
     def on_main_screen(self, *args):
         self.manager.current = "main"
 
 class ClickerApp(App):
+    offline_earned = 0
+
     def build(self):
+        # Офлайн-прогрес: одна формула за весь час з останнього збереження
+        self.offline_earned = economy.settle()
+        save_data()
+        # Один таймер на всю гру з обмеженою частотою, незалежно від кількості генераторів
+        Clock.schedule_interval(self.tick, 1 / UI_REFRESH_RATE)
         sm = ScreenManager()
         sm.add_widget(MenuScreen(name='menu'))
         sm.add_widget(MainScreen(name='main'))
@@ -112,6 +186,31 @@ class ClickerApp(App):
         sm.add_widget(ShopScreen(name='shop'))
         return sm
 
+    def tick(self, dt):
+        if economy.settle():
+            save_data()
+        screen = self.root.current_screen
+        if hasattr(screen, "refresh_score"):
+            screen.refresh_score()
+
+    def on_pause(self):
+        # Android може вбити застосунок у фоні - зберігаємо одразу (з часом виходу)
+        economy.settle()
+        # settle() змінює player напряму - позначаємо зміни, інакше flush() нічого не запише
+        save_data()
+        store.flush()
+        return True
+
+    def on_resume(self):
+        # Дохід за час у фоні
+        if economy.settle():
+            save_data()
+
+    def on_stop(self):
+        economy.settle()
+        save_data()
+        store.close()
+
 if __name__ == '__main__':
     app = ClickerApp()
     app.run()
@@ -0,0 +1,122 @@
+import math
+import time
+from collections import namedtuple
+
+# Пасивний генератор: ціна першого, ріст ціни за кожен куплений, очок на секунду
+Generator = namedtuple('Generator', 'id name base_cost growth rate')
+
+GENERATORS = (
+    Generator('helper', 'Помічник', 50, 1.15, 1),
+    Generator('robot', 'Робот', 600, 1.15, 8),
+    Generator('factory', 'Фабрика', 7000, 1.15, 50),
+)
+
+# Покращення: купується один раз і множить весь пасивний дохід
+Upgrade = namedtuple('Upgrade', 'id name cost multiplier')
+
+UPGRADES = (
+    Upgrade('turbo', 'Турбо', 5000, 2),
+    Upgrade('ai', 'Штучний інтелект', 100000, 3),
+)
+
+# Кожні MILESTONE однакових генераторів подвоюють їхній дохід
+MILESTONE = 25
+# Офлайн-дохід нараховується не більше ніж за стільки секунд
+MAX_OFFLINE = 8 * 60 * 60
+
+
+class Economy:
+    """Пасивний дохід без тіків: очки за проміжок часу рахуються формулою
+
+    Між покупками кількість генераторів не змінюється, тож дохід за dt
+    секунд - це rate() * dt, де rate() - сума (кількість x дохід x бонус
+    за кожні MILESTONE штук) по генераторах, помножена на множники
+    куплених покращень (multiplier()). settle() нараховує очки з моменту
+    player["last_seen"] і зсуває його на зараз. Тому одна й та сама
+    формула дає і дохід між оновленнями екрана, і офлайн-прогрес після
+    запуску чи повернення з фону (обмежений max_offline секунд).
+
+    Кількості генераторів зберігаються в player як "gen_<id>", куплені
+    покращення - як "upgrade_<id>" (плоскі ключі - див. PlayerStore),
+    last_seen - як unix-час.
+
+    >>> player = {'score': 0, 'gen_helper': 2, 'upgrade_turbo': 1, 'last_seen': 100}
+    >>> economy = Economy(player)
+    >>> economy.rate()                  # 2 помічники x 1 очко x2 (Турбо)
+    4
+    >>> economy.settle(now=110.5)       # 4 очки/с x 10.5 с
+    42
+    >>> player['score'], player['last_seen']
+    (42, 110.5)
+    """
+
+    def __init__(self, player, generators=GENERATORS, upgrades=UPGRADES, max_offline=MAX_OFFLINE,
+                 clock=time.time):
+        self.player = player
+        self.generators = {generator.id: generator for generator in generators}
+        self.upgrades = {upgrade.id: upgrade for upgrade in upgrades}
+        self.max_offline = max_offline
+        self.clock = clock
+        self._fraction = 0.0
+
+    def count(self, generator_id):
+        return self.player.get('gen_' + generator_id, 0)
+
+    def cost(self, generator_id):
+        generator = self.generators[generator_id]
+        return math.ceil(generator.base_cost * generator.growth ** self.count(generator_id))
+
+    def owns(self, upgrade_id):
+        return bool(self.player.get('upgrade_' + upgrade_id))
+
+    def multiplier(self):
+        """Добуток множників куплених покращень"""
+        result = 1
+        for upgrade in self.upgrades.values():
+            if self.owns(upgrade.id):
+                result *= upgrade.multiplier
+        return result
+
+    def rate(self):
+        """Очок на секунду з урахуванням бонусів і множника"""
+        total = 0
+        for generator in self.generators.values():
+            count = self.count(generator.id)
+            total += count * generator.rate * 2 ** (count // MILESTONE)
+        return total * self.multiplier()
+
+    def settle(self, now=None):
+        """Нарахувати дохід з last_seen до now; повертає нараховані очки"""
+        if now is None:
+            now = self.clock()
+        last = self.player.get('last_seen')
+        if last is None:
+            last = now
+        # Годинник міг піти назад - тоді нічого не нараховуємо
+        elapsed = min(max(0.0, now - last), self.max_offline)
+        earned = self.rate() * elapsed + self._fraction
+        whole = int(earned)
+        self._fraction = earned - whole
+        self.player['score'] += whole
+        self.player['last_seen'] = now
+        return whole
+
+    def buy(self, generator_id):
+        """Купити генератор (спершу нараховує дохід за старою ставкою)"""
+        self.settle()
+        price = self.cost(generator_id)
+        if price > self.player['score']:
+            return False
+        self.player['score'] -= price
+        self.player['gen_' + generator_id] = self.count(generator_id) + 1
+        return True
+
+    def buy_upgrade(self, upgrade_id):
+        """Купити покращення (один раз; спершу нараховує дохід за старою ставкою)"""
+        self.settle()
+        upgrade = self.upgrades[upgrade_id]
+        if self.owns(upgrade_id) or upgrade.cost > self.player['score']:
+            return False
+        self.player['score'] -= upgrade.cost
+        self.player['upgrade_' + upgrade_id] = 1
+        return True
@@ -0,0 +1,125 @@
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+
+
+class PlayerStore:
+    """Стан гравця в пам'яті з відкладеним записом у JSON-файл
+
+    data - єдине джерело правди: гра змінює словник напряму і викликає
+    save(). Запис відбувається у фоновому потоці через delay секунд після
+    останньої зміни (debounce), але не пізніше ніж через max_delay після
+    першої незбереженої зміни - тож при безперервних кліках файл теж
+    оновлюється. Файл пишеться атомарно: у тимчасовий файл поруч, потім
+    os.replace, тому play.json ніколи не буває записаним наполовину.
+
+    flush() пише одразу (on_pause/on_stop), close() ще й зупиняє потік.
+    Значення в data мають бути простими (числа, рядки): знімок для запису
+    робиться неглибокою копією словника.
+    """
+
+    def __init__(self, path, defaults, delay=1.0, max_delay=5.0):
+        self.path = path
+        self.data = dict(defaults)
+        self.delay = delay
+        self.max_delay = max_delay
+        self._dirty = False
+        self._first_change = None
+        self._deadline = None
+        self._closed = False
+        self._thread = None
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+
+    def load(self):
+        """Прочитати файл у data (відсутній або зіпсований файл - лишаються значення за замовчуванням)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                self.data.update(json.load(file))
+        except (OSError, ValueError):
+            print("невдача((((")
+        return self.data
+
+    def save(self):
+        """Позначити дані зміненими; запис - у фоні після паузи"""
+        now = time.monotonic()
+        with self._condition:
+            self._dirty = True
+            if self._first_change is None:
+                self._first_change = now
+            self._deadline = min(now + self.delay, self._first_change + self.max_delay)
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name='player-store', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self):
+        """Записати незбережені зміни зараз (у потоці, що викликав)"""
+        with self._condition:
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._first_change = self._deadline = None
+        self._write()
+
+    def close(self):
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        with self._condition:
+            while not self._closed:
+                if self._deadline is None:
+                    self._condition.wait()
+                    continue
+                timeout = self._deadline - time.monotonic()
+                if timeout > 0:
+                    self._condition.wait(timeout)
+                    continue
+                self._dirty = False
+                self._first_change = self._deadline = None
+                self._condition.release()
+                try:
+                    self._write()
+                finally:
+                    self._condition.acquire()
+
+    def _file_mode(self):
+        """Права play.json: як у наявного файлу, для нового - 0644"""
+        try:
+            return stat.S_IMODE(os.stat(self.path).st_mode)
+        except FileNotFoundError:
+            return 0o644
+
+    def _write(self):
+        with self._write_lock:
+            # Знімок - під тим самим замком, щоб старіший знімок не перезаписав новіший.
+            # Копія словника робиться під GIL за один крок - UI-потік може змінювати data далі
+            data = json.dumps(dict(self.data), indent=4, ensure_ascii=True)
+            folder = os.path.dirname(os.path.abspath(self.path))
+            try:
+                fd, tmp_path = tempfile.mkstemp(prefix='.play-', suffix='.tmp', dir=folder)
+                try:
+                    # mkstemp створює файл з правами 0600 - беремо права старого файлу
+                    os.chmod(tmp_path, self._file_mode())
+                    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                        file.write(data)
+                        file.flush()
+                        os.fsync(file.fileno())
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            except OSError:
+                print("невдача((((")
+                # Не вдалося - спробуємо ще раз при наступному save()/flush()
+                with self._condition:
+                    self._dirty = True
@@ -0,0 +1,316 @@
+import itertools
+import json
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from contextlib import contextmanager
+
+DB_NAME = 'quiz.sqlite'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS quiz (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS question (
+    id INTEGER PRIMARY KEY,
+    question VARCHAR,
+    answer VARCHAR,
+    wrong1 VARCHAR,
+    wrong2 VARCHAR,
+    wrong3 VARCHAR
+);
+CREATE TABLE IF NOT EXISTS quiz_content (
+    id INTEGER PRIMARY KEY,
+    quiz_id INTEGER REFERENCES quiz (id),
+    question_id INTEGER REFERENCES question (id)
+);
+CREATE INDEX IF NOT EXISTS idx_quiz_content_quiz ON quiz_content (quiz_id, id);
+-- Скомпільований пакет вікторини: всі питання по порядку одним рядком
+CREATE TABLE IF NOT EXISTS quiz_bundle (
+    quiz_id INTEGER PRIMARY KEY REFERENCES quiz (id),
+    version INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+'''
+
+# Питання вікторини по порядку: (id у quiz_content, питання, відповідь, 3 неправильні)
+SQL_QUESTIONS = '''
+SELECT quiz_content.id, question.question, question.answer,
+       question.wrong1, question.wrong2, question.wrong3
+FROM quiz_content JOIN question ON quiz_content.question_id = question.id
+WHERE quiz_content.quiz_id = ?
+ORDER BY quiz_content.id
+'''
+SQL_VERSIONS = 'SELECT id, version FROM quiz ORDER BY id'
+SQL_BUMP = 'UPDATE quiz SET version = version + 1 WHERE id = ?'
+SQL_BUNDLE = 'SELECT version, data FROM quiz_bundle WHERE quiz_id = ?'
+
+QUIZES = [('Своя гра',), ('Хто хоче стати мільйонером?',), ('Найрозумніший',)]
+QUESTIONS = [
+    ('Скільки місяців на рік мають 28 днів?', 'Всі', 'Один', 'Жодного', 'Два'),
+    ('Яким стане зелена скеля, якщо впаде в Червоне море?', 'Мокрим', 'Червоним', 'Не зміниться', 'Фіолетовим'),
+    ('Якою рукою краще розмішувати чай?', 'Ложкою', 'Правою', 'Лівою', 'Будь-якою'),
+    ('Що не має довжини, глибини, ширини, висоти, а можна виміряти?', 'Час', 'Дурність', 'Море', 'Повітря'),
+    ('Коли сіткою можна витягнути воду?', 'Коли вода замерзла', 'Коли немає риби', 'Коли спливла золота рибка', 'Коли сітка порвалася'),
+    ('Що більше слона і нічого не важить?', 'Тінь слона', 'Повітряна куля', 'Парашут', 'Хмара'),
+]
+# (quiz_id, question_id)
+LINKS = [(1, 1), (1, 2), (1, 3), (2, 2), (2, 4), (2, 5), (2, 6), (3, 1), (3, 3), (3, 5), (3, 6)]
+
+
+def pack_bundle(rows):
+    """Питання вікторини -> стиснений JSON-масив записів"""
+    data = json.dumps(rows, ensure_ascii=False, separators=(',', ':'))
+    return zlib.compress(data.encode('utf-8'))
+
+
+def unpack_bundle(data):
+    return tuple(tuple(row) for row in json.loads(zlib.decompress(data)))
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA foreign_keys=ON')
+    return conn
+
+
+class ConnectionPool:
+    """Пул з'єднань SQLite (з'єднання видається одному потоку за раз)"""
+
+    def __init__(self, path=DB_NAME, size=4):
+        self.path = path
+        self.size = size
+        self._pool = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return _connect(self.path)
+        return self._pool.get()
+
+
+class QuizStore:
+    """Вікторини та питання з кешем у пам'яті
+
+    Впорядкований список питань вікторини читається з бази один раз
+    (одним рядком з quiz_bundle, якщо пакет актуальний) і далі віддається
+    з пам'яті. У кожної вікторини є версія (quiz.version):
+    зміна питань через QuizStore збільшує її і скидає кеш одразу, а зміни
+    з інших процесів помічаються перевіркою версій раз на check_interval
+    секунд. Всі методи безпечні для багатопотокового сервера.
+    """
+
+    def __init__(self, path=DB_NAME, pool_size=4, check_interval=5):
+        self.pool = ConnectionPool(path, pool_size)
+        self.check_interval = check_interval
+        self._cache = {}
+        self._versions = {}
+        self._next_check = 0
+        self._lock = threading.Lock()
+
+    def create(self):
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def fill(self):
+        """Тестові вікторини та питання (лише в порожню базу)"""
+        with self.transaction() as conn:
+            if conn.execute('SELECT COUNT(*) FROM quiz').fetchone()[0]:
+                return
+            conn.executemany('INSERT INTO quiz (name) VALUES (?)', QUIZES)
+            conn.executemany('INSERT INTO question (question, answer, wrong1, wrong2, wrong3) '
+                             'VALUES (?, ?, ?, ?, ?)', QUESTIONS)
+            conn.executemany('INSERT INTO quiz_content (quiz_id, question_id) VALUES (?, ?)', LINKS)
+            for quiz_id in {quiz_id for quiz_id, _ in LINKS}:
+                self._write_bundle(conn, quiz_id)
+
+    @contextmanager
+    def transaction(self):
+        with self.pool.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    # --- Читання (з пам'яті) ---
+
+    def quiz_ids(self):
+        self._check_versions()
+        return sorted(self._versions)
+
+    def questions(self, quiz_id):
+        """Всі питання вікторини по порядку (кортеж рядків)"""
+        return self._entry(quiz_id)[2]
+
+    def question_after(self, quiz_id, last_id=0):
+        """Наступне питання після last_id (id у quiz_content) або None"""
+        _, ids, rows = self._entry(quiz_id)
+        index = bisect_right(ids, last_id)
+        return rows[index] if index < len(rows) else None
+
+    def _entry(self, quiz_id):
+        """(версія, id питань, рядки) з кешу; з бази - лише якщо версія змінилася"""
+        self._check_versions()
+        version = self._versions.get(quiz_id)
+        entry = self._cache.get(quiz_id)
+        if entry is not None and entry[0] == version:
+            return entry
+        with self.pool.connection() as conn:
+            bundle = conn.execute(SQL_BUNDLE, (quiz_id,)).fetchone()
+            if bundle is not None and bundle[0] == version:
+                rows = unpack_bundle(bundle[1])
+            else:
+                # Пакет застарів (зміни в обхід QuizStore) - читаємо питання напряму
+                rows = tuple(conn.execute(SQL_QUESTIONS, (quiz_id,)))
+        entry = (version, [row[0] for row in rows], rows)
+        with self._lock:
+            self._cache[quiz_id] = entry
+        return entry
+
+    def _check_versions(self, force=False):
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return
+        with self.pool.connection() as conn:
+            versions = dict(conn.execute(SQL_VERSIONS).fetchall())
+        with self._lock:
+            self._versions = versions
+            self._next_check = now + self.check_interval
+
+    # --- Зміни (збільшують версію вікторини і перебудовують її пакет) ---
+
+    def import_questions(self, records, batch_size=1000):
+        """Масовий імпорт питань: records - словники з ключами quiz, question,
+        answer, wrong1, wrong2, wrong3 (наприклад, з quiz_import.read_questions)
+
+        Записи читаються потоково і пишуться пакетами по batch_size, кожен
+        пакет - окрема транзакція. Вікторини, яких ще немає, створюються за
+        назвою. Повертає {'questions': N, 'quizzes': M}.
+        """
+        with self.pool.connection() as conn:
+            quizzes = {name: quiz_id for quiz_id, name in conn.execute('SELECT id, name FROM quiz')}
+        touched = set()
+        count = 0
+        for batch in batched(records, batch_size):
+            with self.transaction() as conn:
+                links = []
+                for record in batch:
+                    name = record['quiz']
+                    if name not in quizzes:
+                        quizzes[name] = conn.execute('INSERT INTO quiz (name) VALUES (?)', (name,)).lastrowid
+                    links.append(quizzes[name])
+                # id питань видаємо самі: executemany не повертає lastrowid
+                first_id = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM question').fetchone()[0]
+                conn.executemany(
+                    'INSERT INTO question (id, question, answer, wrong1, wrong2, wrong3) VALUES (?, ?, ?, ?, ?, ?)',
+                    ((first_id + index, record['question'], record['answer'],
+                      record['wrong1'], record['wrong2'], record['wrong3'])
+                     for index, record in enumerate(batch))
+                )
+                conn.executemany('INSERT INTO quiz_content (quiz_id, question_id) VALUES (?, ?)',
+                                 ((quiz_id, first_id + index) for index, quiz_id in enumerate(links)))
+                conn.executemany(SQL_BUMP, ((quiz_id,) for quiz_id in set(links)))
+            touched.update(links)
+            count += len(batch)
+        self.build_bundles(touched)
+        return {'questions': count, 'quizzes': len(touched)}
+
+    def build_bundles(self, quiz_ids=None):
+        """Перебудувати пакети вікторин (усіх, якщо quiz_ids не задано)"""
+        if quiz_ids is None:
+            with self.pool.connection() as conn:
+                quiz_ids = [row[0] for row in conn.execute('SELECT id FROM quiz')]
+        for quiz_id in quiz_ids:
+            with self.transaction() as conn:
+                self._write_bundle(conn, quiz_id)
+        self._check_versions(force=True)
+
+    @staticmethod
+    def _write_bundle(conn, quiz_id):
+        """Пакет з поточною версією вікторини (в межах транзакції conn)"""
+        version = conn.execute('SELECT version FROM quiz WHERE id = ?', (quiz_id,)).fetchone()[0]
+        rows = conn.execute(SQL_QUESTIONS, (quiz_id,)).fetchall()
+        conn.execute('INSERT OR REPLACE INTO quiz_bundle (quiz_id, version, data) VALUES (?, ?, ?)',
+                     (quiz_id, version, pack_bundle(rows)))
+
+    def add_question(self, quiz_id, question, answer, wrong1, wrong2, wrong3):
+        """Додати питання в кінець вікторини; повертає id у quiz_content"""
+        with self.transaction() as conn:
+            question_id = conn.execute(
+                'INSERT INTO question (question, answer, wrong1, wrong2, wrong3) VALUES (?, ?, ?, ?, ?)',
+                (question, answer, wrong1, wrong2, wrong3)
+            ).lastrowid
+            content_id = conn.execute('INSERT INTO quiz_content (quiz_id, question_id) VALUES (?, ?)',
+                                      (quiz_id, question_id)).lastrowid
+            conn.execute(SQL_BUMP, (quiz_id,))
+            self._write_bundle(conn, quiz_id)
+        self._check_versions(force=True)
+        return content_id
+
+    def remove_question(self, quiz_id, content_id):
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM quiz_content WHERE id = ? AND quiz_id = ?', (content_id, quiz_id))
+            conn.execute(SQL_BUMP, (quiz_id,))
+            self._write_bundle(conn, quiz_id)
+        self._check_versions(force=True)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store(path=DB_NAME):
+    """Спільне сховище вікторин процесу (створює та заповнює базу при першому виклику)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = QuizStore(path)
+            _store.create()
+            _store.fill()
+    return _store
+
+
+def get_question_after(last_id=0, vict_id=1):
+    """Наступне питання вікторини vict_id після питання last_id (з кешу)"""
+    return get_store().question_after(vict_id, last_id)
+
+
+if __name__ == '__main__':
+    store = get_store()
+    for quiz_id in store.quiz_ids():
+        print(quiz_id, store.questions(quiz_id))
@@ -1,33 +1,45 @@
-from random import randint
+import os
+import sys
+from random import choice
+
+# Файл називається flask.py і перекриває пакет flask: шукаємо flask без своєї папки
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path = [path for path in sys.path if os.path.abspath(path or '.') != HERE]
 from flask import Flask, session, redirect, url_for
-from db_scripts import get_question_after
+sys.path.insert(0, HERE)
+from db_scripts import get_store
 
-quiz = 0
-last_question = 0
+# Стан проходження (вікторина та останнє питання) - у сесії кожного користувача,
+# питання - з кешу в пам'яті (db_scripts.QuizStore);
+# великі банки питань імпортуються через quiz_import.py
+store = get_store(os.path.join(HERE, 'quiz.sqlite'))
 
 def index():
-    global quiz, last_question
-    max_quiz = 3
-    quiz = randint(1, max_quiz)
-    last_question = 0
+    session['quiz'] = choice(store.quiz_ids())
+    # Пакет питань вікторини - одним читанням, далі /test бере питання з пам'яті
+    store.questions(session['quiz'])
+    session['last_question'] = 0
     return '<a href="/test">Тест</a>'
 
 def test():
-    global last_question
-    result = get_question_after(last_question, quiz)
+    if 'quiz' not in session:
+        return redirect(url_for("index"))
+    quiz = session['quiz']
+    result = store.question_after(quiz, session['last_question'])
     if result is None or len(result) == 0:
         return redirect(url_for("result"))
     else:
-        last_question = result[0]
+        session['last_question'] = result[0]
         return "<h1>" + str(quiz) + "<br>" + str(result) + "</h1>"
 def result():
     return "that's all folks"
 
 app = Flask(__name__)
+app.secret_key = os.environ.get('QUIZ_SECRET_KEY', 'quiz-secret-key-change-it')
 app.add_url_rule("/", "index", index)
 app.add_url_rule('/test', 'test', test) # створює правило для URL '/test'
 app.add_url_rule('/result', 'result', result) # створює правило для URL '/test'
 
 if __name__ == '__main__':
-   # Запускаємо веб-сервер:
-   app.run()
+   # Запускаємо веб-сервер (кожен запит - в окремому потоці):
+   app.run(threaded=True)
@@ -0,0 +1,124 @@
+"""Масовий імпорт питань у базу вікторини (db_scripts.QuizStore)
+
+Запуск: python quiz_import.py questions.csv more.json [--db quiz.sqlite] [--batch 1000]
+        python quiz_import.py --build          # лише перебудувати пакети вікторин
+
+Формати (файл читається потоково, не цілком у пам'ять):
+  CSV  - заголовок quiz,question,answer,wrong1,wrong2,wrong3
+  JSON - масив об'єктів з тими ж ключами або JSON Lines (один об'єкт на рядок);
+         замість wrong1..wrong3 можна дати список "wrong" з трьох відповідей
+
+Після імпорту для кожної зміненої вікторини будується пакет (quiz_bundle) -
+всі її питання по порядку одним стисненим рядком, який flask.py читає за
+один запит.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import time
+
+from db_scripts import DB_NAME, QuizStore
+
+FIELDS = ('quiz', 'question', 'answer', 'wrong1', 'wrong2', 'wrong3')
+# Що може стояти між об'єктами: пробіли і (в масиві) одна кома
+ARRAY_SEPARATOR = re.compile(r'\s*(?:,\s*)?')
+LINE_SEPARATOR = re.compile(r'\s*')
+
+
+def normalize(item, where):
+    """Запис питання з об'єкта CSV/JSON; ValueError з місцем помилки"""
+    if not isinstance(item, dict):
+        raise ValueError(f'{where}: expected an object, got {type(item).__name__}')
+    item = dict(item)
+    wrong = item.pop('wrong', None)
+    if wrong is not None:
+        if not isinstance(wrong, list) or len(wrong) != 3:
+            raise ValueError(f'{where}: "wrong" must be a list of 3 answers')
+        item.update(wrong1=wrong[0], wrong2=wrong[1], wrong3=wrong[2])
+    record = {}
+    for field in FIELDS:
+        value = item.get(field)
+        if value is None or not str(value).strip():
+            raise ValueError(f'{where}: missing "{field}"')
+        record[field] = str(value).strip()
+    return record
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8-sig', newline='') as file:
+        reader = csv.DictReader(file)
+        for item in reader:
+            yield normalize(item, f'{path}:{reader.line_num}')
+
+
+def read_json(path, chunk_size=65536):
+    """Об'єкти з JSON-масиву або JSON Lines по одному
+
+    Буфер не копіюється після кожного об'єкта: розбір іде з позиції pos,
+    а прочитане відкидається лише разом з читанням наступного шматка.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding='utf-8-sig') as file:
+        buffer = file.read(chunk_size).lstrip()
+        is_array = buffer.startswith('[')
+        separator = ARRAY_SEPARATOR if is_array else LINE_SEPARATOR
+        pos = 1 if is_array else 0
+        index = 0
+        while True:
+            pos = separator.match(buffer, pos).end()
+            if is_array and buffer.startswith(']', pos):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                more = file.read(chunk_size)
+                if not more:
+                    if buffer[pos:].strip():
+                        raise ValueError(f'{path}: invalid JSON near item {index + 1}')
+                    return
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+            index += 1
+            yield normalize(item, f'{path}: item {index}')
+            pos = end
+            if len(buffer) - pos < chunk_size:
+                more = file.read(chunk_size)
+                if more:
+                    buffer, pos = buffer[pos:] + more, 0
+
+
+def read_questions(path):
+    """Записи питань з файлу (формат - за розширенням: .csv, .json, .jsonl)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return read_csv(path)
+    if extension in ('.json', '.jsonl'):
+        return read_json(path)
+    raise ValueError(f'{path}: unsupported format (use .csv, .json or .jsonl)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import quiz questions from CSV/JSON')
+    parser.add_argument('files', nargs='*')
+    parser.add_argument('--db', default=DB_NAME)
+    parser.add_argument('--batch', type=int, default=1000, help='questions per transaction')
+    parser.add_argument('--build', action='store_true', help='rebuild bundles of all quizzes')
+    args = parser.parse_args()
+
+    store = QuizStore(args.db)
+    store.create()
+    for path in args.files:
+        started = time.perf_counter()
+        counts = store.import_questions(read_questions(path), args.batch)
+        elapsed = time.perf_counter() - started
+        print(f'{path}: {counts["questions"]} questions into {counts["quizzes"]} quizzes '
+              f'in {elapsed:.1f} s ({counts["questions"] / max(elapsed, 1e-9):.0f} rows/s)')
+    if args.build or not args.files:
+        store.build_bundles()
+        print('bundles rebuilt')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,87 +1,185 @@
-from flask import Flask, request, redirect, url_for, session, render_template, flash
+from flask import (Flask, request, redirect, url_for, session, render_template, flash, jsonify,
+                   current_app)
+from werkzeug.local import LocalProxy
+import logging
 import os
+import threading
+import time
+from catalog import Catalog
+from config import Config
+from sessions import create_backend, ServerSideSessionInterface
+from storage import CHECKOUT_ALREADY_OWNED, CHECKOUT_NO_USER, Storage
+from seed_data import USERS, GAMES
+from logs import setup_logging, log_event
+from metrics import setup_metrics, timed
+from fragments import setup_game_cards, MemoryBytecodeCache
+from search import SearchIndex
+from pricing import PricingEngine, Sale
+from passwords import PasswordHasher, RateLimiter, Overloaded, hash_password, is_hashed
+from assets import setup_assets
+from compress import CompressionMiddleware
+from pages import (UserState, check_auth, user_profile, get_page_args, page_etag, not_modified, with_etag,
+                   index_page, cart_page, library_page, games_page)
 
-app = Flask(__name__)
-app.secret_key = 'your-secret-key-change-it-make-it-random-12345'
-
-# База користувачів (логін: {пароль, аватарка, стартовий баланс})
-USERS = {
-    'admin': {
-        'password': 'password123',
-        'avatar': 'https://avatars.steamstatic.com/fef49e7fa7e1997310d705b2a6158ff8dc1cdfeb_full.jpg',
-        'balance': 10000
-    },
-    'user1': {
-        'password': '123456',
-        'avatar': 'https://avatars.steamstatic.com/fef49e7fa7e1997310d705b2a6158ff8dc1cdfeb_full.jpg',
-        'balance': 5000
-    },
-    'gamer': {
-        'password': 'qwerty',
-        'avatar': 'https://avatars.steamstatic.com/fef49e7fa7e1997310d705b2a6158ff8dc1cdfeb_full.jpg',
-        'balance': 15000
-    }
-}
-
-# Дані про ігри
-GAMES = [
-    {
-        'id': 1,
-        'title': 'Cyberpunk 2077',
-        'description': 'Футуристична RPG з відкритим світом у Night City. Створіть свого персонажа та досліджуйте величезний мегаполіс майбутнього.',
-        'image': 'cyberpunk.jpg',
-        'tags': ['RPG', 'Відкритий світ', 'Sci-Fi'],
-        'original_price': 1499,
-        'discount': 40,
-        'current_price': 899
-    },
-    {
-        'id': 2,
-        'title': 'Elden Ring',
-        'description': 'Епічна action-RPG від FromSoftware. Досліджуйте величезний фантастичний світ та долайте складних босів.',
-        'image': 'eldenring.jpg',
-        'tags': ['RPG', 'Екшн', 'Фентезі'],
-        'original_price': 1699,
-        'discount': 25,
-        'current_price': 1274
-    },
-    {
-        'id': 3,
-        'title': 'Counter-Strike 2',
-        'description': 'Легендарний тактичний шутер нового покоління. Працюйте в команді та перемагайте противників.',
-        'image': 'cs2.jpg',
-        'tags': ['Шутер', 'Мультиплеєр', 'Конкурентний'],
-        'original_price': 0,
-        'discount': 0,
-        'current_price': 0
-    },
-    {
-        'id': 4,
-        'title': 'Baldurs Gate 3',
-        'description': 'Епічна RPG за мотивами Dungeons & Dragons. Створюйте свою історію у світі магії та пригод.',
-        'image': 'bg3.jpg',
-        'tags': ['RPG', 'Пригоди', 'Покрокова'],
-        'original_price': 1799,
-        'discount': 15,
-        'current_price': 1529
-    }
-]
+# Маршрути збираються тут і реєструються в create_app()
+ROUTES = []
+
+def route(rule, **options):
+    """Декоратор: запам'ятати view-функцію для реєстрації в застосунку"""
+    def decorator(view):
+        ROUTES.append((rule, view, options))
+        return view
+    return decorator
+
+# Налаштування, від яких залежать Services (решта - оформлення вітрини)
+SERVICE_SETTINGS = ('DATABASE', 'DATABASE_POOL_SIZE', 'SESSION_BACKEND', 'SESSION_DB',
+                    'PASSWORD_ITERATIONS', 'PASSWORD_WORKERS', 'PASSWORD_MAX_PENDING',
+                    'CREDENTIAL_CACHE_TTL', 'LOGIN_RATE_PER_MINUTE', 'SALES_POLL_INTERVAL')
+
+# Скомпільовані шаблони - спільні для всіх застосунків процесу
+TEMPLATE_BYTECODE = MemoryBytecodeCache()
+
+_services = {}
+_services_lock = threading.Lock()
+
+class Services:
+    """Сервіси магазину: база, каталог, пошук, ціни, сесії"""
+
+    def __init__(self, config):
+        # Сесії зберігаються на сервері, в cookie - лише id сесії
+        self.session_backend = create_backend(config['SESSION_BACKEND'], path=config['SESSION_DB'])
+        
+        # База даних: користувачі, ігри, баланси та покупки
+        self.storage = Storage(config['DATABASE'], config['DATABASE_POOL_SIZE'])
+        self.storage.migrate()
+        self.storage.seed(USERS, GAMES)
+        
+        # Паролі зберігаються лише як хеші, перевірка - у пулі потоків
+        self.password_hasher = PasswordHasher(config['PASSWORD_ITERATIONS'],
+                                              config['PASSWORD_WORKERS'],
+                                              config['PASSWORD_MAX_PENDING'],
+                                              config['CREDENTIAL_CACHE_TTL'])
+        self.storage.upgrade_passwords(
+            lambda password: hash_password(password, config['PASSWORD_ITERATIONS']), is_hashed)
+        self.login_limiter = RateLimiter(config['LOGIN_RATE_PER_MINUTE'])
+        
+        # Каталог ігор у пам'яті (індекси за id та тегами); журнал змін цін
+        # читаємо до каталогу, щоб не пропустити зміну між ними
+        price_cursor = self.storage.last_price_change()
+        self.catalog = Catalog(self.storage.load_games())
+        
+        # Пошуковий індекс (оновлюється разом з каталогом)
+        self.search_index = SearchIndex(self.catalog)
+        self.catalog.on_change(lambda game_id: self.search_index.sync(self.catalog, game_id))
+        
+        # Ціни з урахуванням розпродажів (перерахунок лише на межах розпродажів)
+        self.pricing = PricingEngine(
+            self.catalog,
+            load_sales=lambda: [Sale(**row) for row in self.storage.list_sales(time.time())],
+            poll_interval=config['SALES_POLL_INTERVAL'],
+            load_price_changes=self.storage.price_changes,
+            price_cursor=price_cursor)
+
+def get_services(config):
+    """Сервіси для налаштувань config - один екземпляр на процес
+    
+    Вітрини з тією ж базою та тими ж SERVICE_SETTINGS (наприклад
+    steam_clone і test_html в одному процесі) ділять пул з'єднань,
+    каталог, пошуковий індекс, ціни та сесії.
+    """
+    key = tuple(os.path.abspath(config[name]) if name in ('DATABASE', 'SESSION_DB') else config[name]
+                for name in SERVICE_SETTINGS)
+    with _services_lock:
+        services = _services.get(key)
+        if services is None:
+            services = _services[key] = Services(config)
+    return services
+
+class Storefront:
+    """Частина, окрема для кожної вітрини: статика, картки ігор, версія сторінок"""
+
+    def __init__(self, assets, game_cards, page_version):
+        self.assets = assets
+        self.game_cards = game_cards
+        self.page_version = page_version
+
+def create_app(config=None):
+    """Створити застосунок магазину (config - dict, що перекриває Config)"""
+    config = config or {}
+    app = Flask(__name__, static_folder=config.get('STATIC_FOLDER', Config.STATIC_FOLDER))
+    app.config.from_object(Config)
+    app.config.update(config)
+    app.jinja_env.bytecode_cache = TEMPLATE_BYTECODE
+    
+    services = get_services(app.config)
+    app.extensions['steam'] = services
+    app.session_interface = ServerSideSessionInterface(services.session_backend)
+    
+    # Структуроване логування через чергу та фоновий потік
+    setup_logging(app)
+    
+    # Статичні файли з хешем у імені (після python build_static.py)
+    assets = setup_assets(app)
+    
+    # Метрики запитів на /metrics (PROFILE_DIR - профілювання ?profile=1; доступ - METRICS_ALLOW)
+    setup_metrics(app, app.config['PROFILE_DIR'])
+    
+    # Кеш відрендерених карток ігор для головної сторінки (URL у картках
+    # залежать від префікса вітрини, тому кеш у кожної свій)
+    game_cards = setup_game_cards(app, services.catalog, app.config['FRAGMENT_CACHE_SIZE'])
+    app.extensions['storefront'] = Storefront(
+        assets, game_cards, f'{assets.version}:{templates_version(app)}')
+    
+    # Почався чи закінчився розпродаж - перерахувати таблицю цін
+    @app.before_request
+    def refresh_prices():
+        services.pricing.refresh()
+    
+    for rule, view, options in ROUTES:
+        app.add_url_rule(rule, view.__name__, view, **options)
+    
+    # Стиснення HTML/JSON (gzip або brotli за Accept-Encoding)
+    if app.config['COMPRESS']:
+        app.wsgi_app = CompressionMiddleware(app.wsgi_app,
+                                             min_size=app.config['COMPRESS_MIN_SIZE'],
+                                             level=app.config['COMPRESS_LEVEL'],
+                                             brotli_level=app.config['COMPRESS_BROTLI_LEVEL'])
+    
+    # Async-версії сторінок (/async/...) - лише якщо ввімкнено (потрібен flask[async])
+    if app.config['ASYNC_VIEWS']:
+        from async_views import async_store
+        app.register_blueprint(async_store)
+    
+    return app
+
+def templates_version(app):
+    """Час останньої зміни шаблонів (однаковий у всіх воркерах)"""
+    folder = os.path.join(app.root_path, app.template_folder)
+    return max((entry.stat().st_mtime_ns for entry in os.scandir(folder)), default=0)
+
+def _service(name):
+    return LocalProxy(lambda: getattr(current_app.extensions['steam'], name))
+
+# Сервіси застосунку, що обробляє поточний запит
+session_backend = _service('session_backend')
+storage = _service('storage')
+catalog = _service('catalog')
+search_index = _service('search_index')
+pricing = _service('pricing')
+password_hasher = _service('password_hasher')
+login_limiter = _service('login_limiter')
+
+# Максимум операцій в одному запиті /api/cart
+MAX_CART_OPS = 100
 
 def get_current_user():
     """Отримати дані поточного користувача"""
     username = session.get('username')
-    if username and username in USERS:
-        return {
-            'username': username,
-            'avatar': USERS[username]['avatar']
-        }
-    return None
-
-def check_auth():
-    """Перевірка авторизації"""
-    if 'username' not in session:
-        return False
-    return True
+    return user_profile(username, storage.get_user(username) if username else None)
+
+def get_user_data(username):
+    """Отримати сесійні дані користувача (кошик) зі сховища"""
+    return session_backend.get(f'user_{username}') or {}
 
 def init_user_data():
     """Ініціалізація даних користувача"""
@@ -90,36 +188,33 @@ def init_user_data():
     
     username = session['username']
     
-    # Ініціалізація балансу користувача
-    if f'balance_{username}' not in session:
-        session[f'balance_{username}'] = USERS[username]['balance']
-    
-    # Ініціалізація кошика
-    if f'cart_{username}' not in session:
-        session[f'cart_{username}'] = []
-    
-    # Ініціалізація куплених ігор
-    if f'purchased_{username}' not in session:
-        session[f'purchased_{username}'] = []
+    # Ініціалізація кошика (баланс та бібліотека - в базі даних)
+    if 'cart' not in get_user_data(username):
+        # Порожній список операцій: створює кошик, не чіпаючи вже доданого
+        update_user_cart(username, [])
     
     return True
 
 def get_user_balance():
     """Отримати баланс користувача"""
     username = session.get('username')
-    return session.get(f'balance_{username}', 0)
+    return storage.get_balance(username)
 
 def get_user_cart():
     """Отримати кошик користувача"""
     username = session.get('username')
-    return session.get(f'cart_{username}', [])
+    return get_user_data(username).get('cart', [])
 
 def get_user_purchased():
     """Отримати куплені ігри користувача"""
     username = session.get('username')
-    return session.get(f'purchased_{username}', [])
+    return storage.get_purchased_ids(username)
+
+def get_user_state():
+    """Баланс, кошик, куплені ігри та профіль поточного користувача"""
+    return UserState(get_user_balance(), get_user_cart(), get_user_purchased(), get_current_user())
 
-@app.route('/login', methods=['GET', 'POST'])
+@route('/login', methods=['GET', 'POST'])
 def login():
     """Сторінка входу"""
     if request.method == 'POST':
@@ -127,21 +222,37 @@ def login():
         password = request.form.get('password', '')
         remember = request.form.get('remember')
         
-        print(f"🔐 Login attempt: {username}")
+        log_event('login_attempt', logging.DEBUG, username=username)
+        
+        # Обмеження кількості спроб з однієї IP-адреси
+        if not login_limiter.allow(request.remote_addr):
+            log_event('login_rate_limited', logging.WARNING, username=username)
+            flash('❌ Забагато спроб входу. Спробуйте за хвилину.', 'error')
+            return redirect(url_for('login'))
+        
+        # Перевірка логіну та пароля (хеш рахується в пулі потоків)
+        user = storage.get_user(username)
+        try:
+            valid = password_hasher.verify(user['password'] if user else None, password, username)
+        except Overloaded:
+            log_event('login_overloaded', logging.WARNING, username=username)
+            flash('❌ Сервер перевантажений. Спробуйте ще раз.', 'error')
+            return redirect(url_for('login'))
         
-        # Перевірка логіну та пароля
-        if username in USERS and USERS[username]['password'] == password:
+        if valid:
+            # Новий id сесії: id, відомий до входу, не отримує доступу до акаунту
+            session.regenerate()
             session['username'] = username
             
             # Запам'ятати (постійна сесія)
             if remember:
                 session.permanent = True
             
-            print(f"✅ Login successful: {username}")
+            log_event('login_success', username=username)
             flash(f'Вітаємо, {username}!', 'success')
             return redirect(url_for('index'))
         else:
-            print(f"❌ Login failed: {username}")
+            log_event('login_failed', logging.WARNING, username=username)
             flash('❌ Невірний логін або пароль!', 'error')
             return redirect(url_for('login'))
     
@@ -151,52 +262,152 @@ def login():
     
     return render_template('login.html')
 
-@app.route('/logout', methods=['POST'])
+@route('/logout', methods=['POST'])
 def logout():
     """Вихід з акаунту"""
     username = session.get('username')
     session.clear()
-    print(f"👋 Logout: {username}")
+    session.regenerate()
+    log_event('logout', username=username)
     flash('Ви вийшли з акаунту', 'info')
     return redirect(url_for('login'))
 
-@app.route('/')
+@route('/')
 def index():
     """Головна сторінка магазину"""
     if not check_auth():
         return redirect(url_for('login'))
     
     init_user_data()
+    return index_page(get_user_state())
+
+@route('/api/games')
+def api_games():
+    """Сторінка каталогу у JSON (?cursor=&limit=, ?html=1 - з готовими картками)"""
+    if not check_auth():
+        return jsonify(error='unauthorized'), 401
     
-    print("=" * 50)
-    print("📍 INDEX PAGE - Loading...")
-    
-    balance = get_user_balance()
-    cart_count = len(get_user_cart())
-    purchased_ids = get_user_purchased()
-    current_user = get_current_user()
+    return games_page(get_user_purchased())
+
+@route('/api/search')
+def api_search():
+    """Пошук ігор (?q=&tags=RPG,Екшн&offset=&limit=), результати за релевантністю
+
+    На відміну від /api/games, де cursor - id останньої гри, тут сторінки
+    задаються зсувом offset у списку результатів (next_offset - наступна).
+    """
+    if not check_auth():
+        return jsonify(error='unauthorized'), 401
+    
+    query = request.args.get('q', '').strip()
+    tags = [tag for tag in request.args.get('tags', '').split(',') if tag]
+    _, limit = get_page_args()
+    offset = max(0, request.args.get('offset', 0, type=int))
+    
+    with timed('search'):
+        hits, total = search_index.search(query, tags, offset, limit)
+    
+    results = []
+    for game_id, score in hits:
+        game = catalog.get(game_id)
+        if game is not None:
+            results.append(dict(game, score=score))
+    
+    next_offset = offset + limit
+    return jsonify(results=results,
+                   total=total,
+                   next_offset=next_offset if next_offset < total else None)
+
+def cart_summary(cart_ids):
+    """Кошик у JSON: ігри, кількість та сума"""
+    games = catalog.games_by_ids(cart_ids)
+    return {
+        'cart': [game['id'] for game in games],
+        'games': games,
+        'count': len(games),
+        'total': pricing.total(game['id'] for game in games),
+    }
+
+def validate_cart_ops(ops, purchased_ids):
+    """Перевірити операції з кошиком; повертає список помилок (порожній - все добре)"""
+    if not isinstance(ops, list) or not ops:
+        return [{'error': 'ops must be a non-empty list'}]
+    if len(ops) > MAX_CART_OPS:
+        return [{'error': f'too many ops (max {MAX_CART_OPS})'}]
+    
+    errors = []
+    for index, op in enumerate(ops):
+        kind = op.get('op') if isinstance(op, dict) else None
+        if kind == 'clear':
+            continue
+        if kind not in ('add', 'remove'):
+            errors.append({'index': index, 'error': 'op must be add, remove or clear'})
+            continue
+        game_id = op.get('game_id')
+        if not isinstance(game_id, int) or isinstance(game_id, bool) or game_id not in catalog:
+            errors.append({'index': index, 'error': 'unknown game_id'})
+        elif kind == 'add' and game_id in purchased_ids:
+            errors.append({'index': index, 'error': 'already purchased'})
+    return errors
+
+def apply_cart_ops(cart_ids, ops):
+    """Застосувати операції до кошика (ops вже перевірені)"""
+    cart_ids = list(cart_ids)
+    for op in ops:
+        if op['op'] == 'clear':
+            cart_ids = []
+        elif op['op'] == 'add':
+            if op['game_id'] not in cart_ids:
+                cart_ids.append(op['game_id'])
+        elif op['game_id'] in cart_ids:
+            cart_ids.remove(op['game_id'])
+    return cart_ids
+
+def update_user_cart(username, ops):
+    """Атомарно застосувати операції до кошика у сховищі; повертає новий кошик
+
+    Кошик читається і записується в одному update, тому зміни з інших
+    вкладок між читанням і записом не губляться.
+    """
+    def apply(data):
+        data = data or {}
+        data['cart'] = apply_cart_ops(data.get('cart', []), ops)
+        return data
+    return session_backend.update(f'user_{username}', apply)['cart']
+
+def remove_ops(game_ids):
+    return [{'op': 'remove', 'game_id': game_id} for game_id in game_ids]
+
+@route('/api/cart', methods=['GET', 'POST'])
+def api_cart():
+    """Кошик у JSON; POST {"ops": [{"op": "add"|"remove", "game_id": 1}, {"op": "clear"}]}
     
-    print(f"   User: {session.get('username')}")
-    print(f"   Balance: {balance} ₴")
-    print(f"   Games: {len(GAMES)}")
-    print(f"   Cart items: {cart_count}")
+    Усі операції застосовуються разом: якщо хоч одна некоректна, кошик
+    не змінюється і повертається 400 зі списком помилок.
+    """
+    if not check_auth():
+        return jsonify(error='unauthorized'), 401
     
-    try:
-        html = render_template('index.html', 
-                             games=GAMES, 
-                             cart_count=cart_count,
-                             balance=balance,
-                             purchased_ids=purchased_ids,
-                             current_user=current_user)
-        print(f"   ✅ Rendered successfully")
-        print("=" * 50)
-        return html
-    except Exception as e:
-        print(f"   ❌ ERROR: {e}")
-        print("=" * 50)
-        return f"<h1>Error loading page</h1><pre>{e}</pre>"
-
-@app.route('/add-to-cart/<int:game_id>', methods=['POST'])
+    username = session['username']
+    if request.method == 'GET':
+        cart_ids = get_user_cart()
+        etag = page_etag(cart_ids)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        return with_etag(jsonify(cart_summary(cart_ids)), etag)
+    
+    payload = request.get_json(silent=True)
+    ops = payload.get('ops') if isinstance(payload, dict) else None
+    errors = validate_cart_ops(ops, set(get_user_purchased()))
+    if errors:
+        return jsonify(error='invalid ops', errors=errors), 400
+    
+    cart_ids = update_user_cart(username, ops)
+    log_event('cart_batch', logging.DEBUG, ops=len(ops))
+    return jsonify(cart_summary(cart_ids))
+
+@route('/add-to-cart/<int:game_id>', methods=['POST'])
 def add_to_cart(game_id):
     """Додати гру в кошик"""
     if not check_auth():
@@ -205,53 +416,30 @@ def add_to_cart(game_id):
     init_user_data()
     username = session['username']
     
-    print(f"➕ Adding game {game_id} to cart for {username}...")
-    
     # Перевірка чи гра вже куплена
     if game_id in get_user_purchased():
         flash('Ви вже купили цю гру!', 'info')
         return redirect(url_for('index'))
     
-    cart = get_user_cart()
-    if game_id not in cart:
-        cart.append(game_id)
-        session[f'cart_{username}'] = cart
-        session.modified = True
-        print(f"   ✅ Game {game_id} added!")
+    if game_id not in get_user_cart():
+        update_user_cart(username, [{'op': 'add', 'game_id': game_id}])
+        log_event('cart_add', logging.DEBUG, game_id=game_id)
         flash('Гру додано до кошика!', 'success')
     else:
         flash('Ця гра вже в кошику!', 'info')
     
     return redirect(url_for('index'))
 
-@app.route('/cart')
+@route('/cart')
 def cart():
     """Сторінка кошика"""
     if not check_auth():
         return redirect(url_for('login'))
     
     init_user_data()
-    
-    cart_ids = get_user_cart()
-    cart_games = [game for game in GAMES if game['id'] in cart_ids]
-    
-    total = sum(game['current_price'] for game in cart_games)
-    cart_count = len(cart_games)
-    balance = get_user_balance()
-    current_user = get_current_user()
-    
-    try:
-        html = render_template('cart.html', 
-                             games=cart_games, 
-                             total=total, 
-                             cart_count=cart_count,
-                             balance=balance,
-                             current_user=current_user)
-        return html
-    except Exception as e:
-        return f"<h1>Error loading cart</h1><pre>{e}</pre>"
-
-@app.route('/checkout', methods=['POST'])
+    return cart_page(get_user_state())
+
+@route('/checkout', methods=['POST'])
 def checkout():
     """Оформлення замовлення (покупка)"""
     if not check_auth():
@@ -261,58 +449,47 @@ def checkout():
     username = session['username']
     
     cart_ids = get_user_cart()
-    cart_games = [game for game in GAMES if game['id'] in cart_ids]
-    total = sum(game['current_price'] for game in cart_games)
-    balance = get_user_balance()
     
-    if not cart_games:
+    if not catalog.games_by_ids(cart_ids):
         flash('Ваш кошик порожній!', 'warning')
         return redirect(url_for('cart'))
     
-    if balance >= total:
-        # Оплата успішна
-        session[f'balance_{username}'] = balance - total
-        
-        purchased = get_user_purchased()
-        purchased.extend(cart_ids)
-        session[f'purchased_{username}'] = purchased
-        
-        session[f'cart_{username}'] = []
-        session.modified = True
+    # Перевірка балансу, списання та запис покупок - однією транзакцією
+    result = storage.checkout(username, cart_ids, pricing.prices_for(cart_ids))
+    
+    if result.ok:
+        # Оплата успішна: прибираємо з кошика лише оплачені ігри (не те, що додали в іншій вкладці)
+        update_user_cart(username, remove_ops(cart_ids))
         
-        print(f"✅ Payment successful for {username}!")
-        flash(f'✅ Оплата успішна! Списано {total} ₴. Ігри додано до вашої бібліотеки!', 'success')
+        log_event('checkout', total=result.total, games=result.game_ids)
+        flash(f'✅ Оплата успішна! Списано {result.total} ₴. Ігри додано до вашої бібліотеки!', 'success')
+        return redirect(url_for('library'))
+    elif result.status == CHECKOUT_NO_USER:
+        # Облікового запису більше немає в базі - сесія недійсна
+        session.clear()
+        session.regenerate()
+        flash('Користувача не знайдено. Увійдіть знову.', 'error')
+        return redirect(url_for('login'))
+    elif result.status == CHECKOUT_ALREADY_OWNED:
+        # Всі ігри з кошика вже куплені (наприклад, в іншій вкладці)
+        update_user_cart(username, remove_ops(cart_ids))
+        flash('Ці ігри вже є у вашій бібліотеці!', 'info')
         return redirect(url_for('library'))
     else:
-        shortage = total - balance
+        shortage = result.total - result.balance
         flash(f'❌ Оплата відхилена! Недостатньо коштів. Бракує {shortage} ₴', 'error')
         return redirect(url_for('cart'))
 
-@app.route('/library')
+@route('/library')
 def library():
     """Бібліотека куплених ігор"""
     if not check_auth():
         return redirect(url_for('login'))
     
     init_user_data()
-    
-    purchased_ids = get_user_purchased()
-    purchased_games = [game for game in GAMES if game['id'] in purchased_ids]
-    balance = get_user_balance()
-    cart_count = len(get_user_cart())
-    current_user = get_current_user()
-    
-    try:
-        html = render_template('library.html',
-                             games=purchased_games,
-                             balance=balance,
-                             cart_count=cart_count,
-                             current_user=current_user)
-        return html
-    except Exception as e:
-        return f"<h1>Error loading library</h1><pre>{e}</pre>"
-
-@app.route('/add-balance', methods=['POST'])
+    return library_page(get_user_state())
+
+@route('/add-balance', methods=['POST'])
 def add_balance():
     """Поповнити баланс"""
     if not check_auth():
@@ -324,11 +501,9 @@ def add_balance():
     try:
         amount = int(request.form.get('amount', 0))
         if amount > 0 and amount <= 10000:
-            current_balance = get_user_balance()
-            session[f'balance_{username}'] = current_balance + amount
-            session.modified = True
+            storage.add_balance(username, amount)
             flash(f'✅ Баланс поповнено на {amount} ₴', 'success')
-            print(f"💰 Balance added for {username}: +{amount} ₴")
+            log_event('balance_added', amount=amount)
         else:
             flash('❌ Невірна сума! (від 1 до 10000 ₴)', 'error')
     except:
@@ -336,7 +511,7 @@ def add_balance():
     
     return redirect(url_for('index'))
 
-@app.route('/remove-from-cart/<int:game_id>', methods=['POST'])
+@route('/remove-from-cart/<int:game_id>', methods=['POST'])
 def remove_from_cart(game_id):
     """Видалити гру з кошика"""
     if not check_auth():
@@ -345,16 +520,13 @@ def remove_from_cart(game_id):
     init_user_data()
     username = session['username']
     
-    cart = get_user_cart()
-    if game_id in cart:
-        cart.remove(game_id)
-        session[f'cart_{username}'] = cart
-        session.modified = True
+    if game_id in get_user_cart():
+        update_user_cart(username, remove_ops([game_id]))
         flash('Гру видалено з кошика', 'info')
     
     return redirect(url_for('cart'))
 
-@app.route('/clear-cart', methods=['POST'])
+@route('/clear-cart', methods=['POST'])
 def clear_cart():
     """Очистити весь кошик"""
     if not check_auth():
@@ -363,13 +535,13 @@ def clear_cart():
     init_user_data()
     username = session['username']
     
-    session[f'cart_{username}'] = []
-    session.modified = True
+    # Прибираємо ігри, які були в кошику на момент запиту
+    update_user_cart(username, remove_ops(get_user_cart()))
     flash('Кошик очищено', 'info')
     
     return redirect(url_for('cart'))
 
-@app.route('/reset', methods=['POST'])
+@route('/reset', methods=['POST'])
 def reset():
     """Скинути всі дані (для тестування)"""
     if not check_auth():
@@ -378,15 +550,16 @@ def reset():
     username = session.get('username')
     
     # Скидаємо тільки дані користувача, але не логаут
-    session[f'balance_{username}'] = USERS[username]['balance']
-    session[f'cart_{username}'] = []
-    session[f'purchased_{username}'] = []
-    session.modified = True
+    storage.reset_user(username)
+    update_user_cart(username, remove_ops(get_user_cart()))
     
-    flash(f'🔄 Дані скинуто! Баланс: {USERS[username]["balance"]} ₴', 'info')
+    flash(f'🔄 Дані скинуто! Баланс: {get_user_balance()} ₴', 'info')
     return redirect(url_for('index'))
 
 if __name__ == '__main__':
+    # Сервер для розробки; для production - python serve.py або gunicorn wsgi:app
+    app = create_app()
+    
     print("\n" + "=" * 70)
     print("🎮 STEAM STORE - Starting server...")
     print("=" * 70)
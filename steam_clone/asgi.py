@@ -0,0 +1,6 @@
+# ASGI-точка входу (uvicorn asgi:app). Async-сторінки магазину - під /async/ (STEAM_ASYNC_VIEWS=1)
+from asgiref.wsgi import WsgiToAsgi
+
+from wsgi import app as wsgi_app
+
+app = WsgiToAsgi(wsgi_app)
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import mimetypes
+import os
+
+from flask import abort, request, send_from_directory, url_for
+
+from build_static import DIST_DIR, MANIFEST
+
+# Файли з хешем у імені ніколи не змінюються - кешуємо на рік
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+class Assets:
+    """Фінгерпринтовані статичні файли за маніфестом build_static.py"""
+
+    def __init__(self, static_dir):
+        self.dist = os.path.join(static_dir, DIST_DIR)
+        self.files = {}
+        self.thumbs = {}
+        self.version = ''
+        self.load()
+
+    def load(self):
+        """Прочитати маніфест (якщо збірки ще не було - працюємо без неї)"""
+        try:
+            with open(os.path.join(self.dist, MANIFEST), 'rb') as file:
+                raw = file.read()
+            manifest = json.loads(raw)
+        except (OSError, ValueError):
+            raw, manifest = b'', {}
+        # Версія збірки (для ETag сторінок: нова збірка - нові URL у HTML)
+        self.version = hashlib.sha1(raw).hexdigest()[:12]
+        self.files = manifest.get('files', {})
+        self.thumbs = manifest.get('thumbs', {})
+
+    def url(self, path):
+        """URL файлу: з хешем, якщо файл є у збірці, інакше звичайний /static"""
+        target = self.files.get(path)
+        if target is None:
+            return url_for('static', filename=path)
+        return url_for('static_dist', filename=target)
+
+    def thumb_sources(self, path):
+        """Список (тип, URL) зменшених копій зображення: спочатку AVIF, потім WebP"""
+        thumbs = self.thumbs.get(path, {})
+        return [(f'image/{fmt}', url_for('static_dist', filename=thumbs[fmt]))
+                for fmt in ('avif', 'webp') if fmt in thumbs]
+
+
+def setup_assets(app):
+    """Хелпери static_url()/static_thumbs() та роздача /static/dist з довгим кешем"""
+    assets = Assets(app.static_folder)
+
+    @app.route('/static/dist/<path:filename>')
+    def static_dist(filename):
+        """Файл зі збірки; стиснений варіант, якщо клієнт його приймає"""
+        encodings = request.accept_encodings
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if encodings[encoding] and os.path.isfile(os.path.join(assets.dist, filename + suffix)):
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                response = send_from_directory(assets.dist, filename + suffix, mimetype=mimetype)
+                response.headers['Content-Encoding'] = encoding
+                break
+        else:
+            if not os.path.isfile(os.path.join(assets.dist, filename)):
+                abort(404)
+            response = send_from_directory(assets.dist, filename)
+        response.headers['Cache-Control'] = IMMUTABLE
+        response.vary.add('Accept-Encoding')
+        return response
+
+    app.jinja_env.globals['static_url'] = assets.url
+    app.jinja_env.globals['static_thumbs'] = assets.thumb_sources
+    return assets
+
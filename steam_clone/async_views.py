@@ -0,0 +1,61 @@
+import asyncio
+
+from flask import Blueprint, jsonify, redirect, session, url_for
+
+from pages import (UserState, check_auth, services, user_profile,
+                   index_page, cart_page, library_page, games_page)
+
+# Async-версії сторінок магазину (Flask async views, потрібен asgiref).
+# Відрізняються від app.py лише тим, як збирається стан користувача -
+# ETag/304, рендер і метрики спільні (pages.py). Вмикаються ASYNC_VIEWS=1.
+async_store = Blueprint('async_store', __name__, url_prefix='/async')
+
+
+async def load_user_state(username):
+    """Баланс, кошик, куплені ігри та профіль - паралельно, без блокування циклу подій
+
+    Кожне звернення до SQLite чи сховища сесій виконується в пулі потоків
+    (asyncio.to_thread), а asyncio.gather запускає їх одночасно. Лише
+    читання: відсутній кошик - порожній, записувати його не потрібно.
+    """
+    storage = services().storage
+    balance, data, purchased, user = await asyncio.gather(
+        asyncio.to_thread(storage.get_balance, username),
+        asyncio.to_thread(services().session_backend.get, f'user_{username}'),
+        asyncio.to_thread(storage.get_purchased_ids, username),
+        asyncio.to_thread(storage.get_user, username),
+    )
+    return UserState(balance, (data or {}).get('cart', []), purchased, user_profile(username, user))
+
+
+@async_store.route('/')
+async def index():
+    """Головна сторінка магазину (async)"""
+    if not check_auth():
+        return redirect(url_for('login'))
+    return index_page(await load_user_state(session['username']))
+
+
+@async_store.route('/cart')
+async def cart():
+    """Сторінка кошика (async)"""
+    if not check_auth():
+        return redirect(url_for('login'))
+    return cart_page(await load_user_state(session['username']))
+
+
+@async_store.route('/library')
+async def library():
+    """Бібліотека куплених ігор (async)"""
+    if not check_auth():
+        return redirect(url_for('login'))
+    return library_page(await load_user_state(session['username']))
+
+
+@async_store.route('/api/games')
+async def api_games():
+    """Сторінка каталогу у JSON (async)"""
+    if not check_auth():
+        return jsonify(error='unauthorized'), 401
+    purchased = await asyncio.to_thread(services().storage.get_purchased_ids, session['username'])
+    return games_page(purchased)
@@ -0,0 +1,116 @@
+"""Порівняння sync та async сторінок при багатьох одночасних з'єднаннях
+
+Запуск: python bench_async.py [--connections 50,200] [--duration 10] [--workers 2]
+
+Запускає serve.py і відкриває N одночасних keep-alive з'єднань
+(asyncio-клієнт, без сторонніх бібліотек). Кожне з'єднання логіниться
+і ганяє по колу /, /cart, /library, /api/games - спершу звичайні
+маршрути, потім ті самі під /async. Друкує запити/с та p95 затримку.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+
+from loadtest import HERE, USERS, free_port, wait_for_port
+
+ROUTES = ('/', '/cart', '/library', '/api/games?limit=24')
+
+
+async def http_request(reader, writer, method, path, cookie='', body=b''):
+    headers = [f'{method} {path} HTTP/1.1', 'Host: 127.0.0.1', 'Connection: keep-alive']
+    if cookie:
+        headers.append(f'Cookie: {cookie}')
+    if body:
+        headers.append('Content-Type: application/x-www-form-urlencoded')
+    headers.append(f'Content-Length: {len(body)}')
+    writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode() + body)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length = 0
+    set_cookie = ''
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        name = name.lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'set-cookie':
+            set_cookie = value.strip().split(';', 1)[0]
+    await reader.readexactly(length)
+    return status, set_cookie
+
+
+async def connection(port, index, prefix, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    username, password = USERS[index % len(USERS)]
+    body = urllib.parse.urlencode({'username': username, 'password': password}).encode()
+    _, cookie = await http_request(reader, writer, 'POST', '/login', body=body)
+
+    count = 0
+    while time.perf_counter() < deadline:
+        path = prefix + ROUTES[count % len(ROUTES)]
+        started = time.perf_counter()
+        status, _ = await http_request(reader, writer, 'GET', path, cookie)
+        latencies.append(time.perf_counter() - started)
+        if status != 200:
+            errors.append(status)
+        count += 1
+    writer.close()
+
+
+async def run_clients(port, connections, prefix, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        connection(port, i, prefix, deadline, latencies, errors) for i in range(connections)
+    ))
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    return len(latencies) / duration, p95, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync vs async routes under many connections')
+    parser.add_argument('--connections', default='50,200')
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--server', default='auto', choices=['auto', 'gunicorn', 'prefork', 'single'])
+    args = parser.parse_args()
+
+    port = free_port()
+    tmp = tempfile.mkdtemp()
+    env = dict(os.environ,
+               STEAM_DB=os.path.join(tmp, 'steam.db'),
+               STEAM_SESSION_BACKEND='sqlite',
+               STEAM_SESSION_DB=os.path.join(tmp, 'sessions.db'),
+               STEAM_LOGIN_RATE='100000',
+               STEAM_ASYNC_VIEWS='1')
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, 'serve.py'), '--bind', f'127.0.0.1:{port}',
+         '--workers', str(args.workers), '--server', args.server],
+        cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        time.sleep(1)
+        print(f'{"routes":>8} {"conns":>6} {"req/s":>8} {"p95 ms":>8} {"errors":>7}')
+        for connections in (int(c) for c in args.connections.split(',')):
+            for name, prefix in (('sync', ''), ('async', '/async')):
+                rps, p95, errors = asyncio.run(run_clients(port, connections, prefix, args.duration))
+                print(f'{name:>8} {connections:>6} {rps:>8.0f} {p95 * 1000:>8.1f} {errors:>7}')
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == '__main__':
+    main()
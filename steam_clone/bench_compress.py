@@ -0,0 +1,63 @@
+"""Скільки байтів економить стиснення відповідей і скільки коштує CPU
+
+Запуск: python bench_compress.py [--repeat 200]
+
+Рендерить сторінки магазину (Flask test client, без стиснення), потім
+стискає кожне тіло через CompressionMiddleware з різними кодуваннями та
+рівнями. Друкує розмір до/після і час CPU на одне стиснення.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app import create_app
+from compress import CompressionMiddleware, brotli
+
+PAGES = ('/', '/cart', '/library', '/api/games?limit=24', '/api/games?limit=100&html=1')
+
+
+def compress_body(body, encoding, level):
+    """Прогнати тіло через middleware; повертає стиснені байти"""
+    def app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/html; charset=utf-8')])
+        # Кількома шматками, як потокова відповідь
+        return [body[i:i + 8192] for i in range(0, len(body), 8192)]
+
+    middleware = CompressionMiddleware(app, level=level, brotli_level=level)
+    environ = {'REQUEST_METHOD': 'GET', 'HTTP_ACCEPT_ENCODING': encoding}
+    return b''.join(middleware(environ, lambda status, headers, exc_info=None: None))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compression ratio and CPU cost per page')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    app = create_app({'DATABASE': os.path.join(tmp, 'steam.db'), 'LOG_LEVEL': 'ERROR', 'COMPRESS': 0})
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'password123'})
+    client.post('/add-to-cart/1')
+    client.post('/add-to-cart/2')
+
+    variants = [('gzip', 1), ('gzip', 6), ('gzip', 9)]
+    if brotli is not None:
+        variants += [('br', 1), ('br', 4), ('br', 11)]
+
+    print(f'{"page":<28} {"enc":>4} {"lvl":>4} {"bytes":>8} {"saved":>7} {"cpu ms":>8}')
+    for page in PAGES:
+        body = client.get(page).data
+        print(f'{page:<28} {"-":>4} {"-":>4} {len(body):>8}')
+        for encoding, level in variants:
+            repeat = args.repeat if level < 9 else max(1, args.repeat // 10)
+            started = time.process_time()
+            for _ in range(repeat):
+                compressed = compress_body(body, encoding, level)
+            cpu = (time.process_time() - started) / repeat
+            saved = 1 - len(compressed) / len(body)
+            print(f'{"":<28} {encoding:>4} {level:>4} {len(compressed):>8} {saved:>6.0%} {cpu * 1000:>8.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Бенчмарк /login під сплеском одночасних входів
+
+Запуск: python bench_login.py [--logins 200] [--concurrency 32] [--workers 4]
+
+Запускає застосунок у процесі (Flask test client) на тимчасовій базі і
+одночасно з concurrency потоків виконує logins входів. Три сценарії:
+  cold  - кеш перевірених паролів вимкнено, кожен вхід рахує PBKDF2;
+  warm  - повторні входи з тими самими даними беруться з кешу;
+  limit - всі запити з однієї IP-адреси, більшість відсікає rate limiter.
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from seed_data import USERS
+
+
+def run(app, logins, concurrency, same_ip=False):
+    accounts = list(USERS.items())
+
+    def login(i):
+        username, data = accounts[i % len(accounts)]
+        ip = '10.0.0.1' if same_ip else f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}'
+        client = app.test_client()
+        started = time.perf_counter()
+        response = client.post('/login', data={'username': username, 'password': data['password']},
+                               environ_base={'REMOTE_ADDR': ip})
+        elapsed = time.perf_counter() - started
+        return elapsed, response.headers.get('Location', '').endswith('/')
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(login, range(logins)))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(elapsed for elapsed, _ in results)
+    ok = sum(1 for _, success in results if success)
+    return {
+        'logins_per_s': logins / wall,
+        'ok': ok,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Login throughput under a burst')
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=4, help='KDF thread pool size')
+    parser.add_argument('--iterations', type=int, default=200000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    base = {
+        'DATABASE': os.path.join(tmp, 'steam.db'),
+        'SESSION_BACKEND': 'memory',
+        'LOG_LEVEL': 'ERROR',
+        'PASSWORD_ITERATIONS': args.iterations,
+        'PASSWORD_WORKERS': args.workers,
+        'PASSWORD_MAX_PENDING': args.concurrency * 2,
+    }
+    scenarios = (
+        ('cold', dict(base, CREDENTIAL_CACHE_TTL=0), False),
+        ('warm', dict(base, CREDENTIAL_CACHE_TTL=60), False),
+        ('limit', dict(base, CREDENTIAL_CACHE_TTL=60), True),
+    )
+
+    print(f'{"scenario":>8} {"logins/s":>9} {"ok":>5} {"p50 ms":>8} {"p95 ms":>8}')
+    for name, config, same_ip in scenarios:
+        app = create_app(config)
+        result = run(app, args.logins, args.concurrency, same_ip)
+        print(f'{name:>8} {result["logins_per_s"]:>9.0f} {result["ok"]:>5} '
+              f'{result["p50_ms"]:>8.1f} {result["p95_ms"]:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
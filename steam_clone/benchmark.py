@@ -0,0 +1,285 @@
+"""Бенчмарк сценарію покупця: логін -> каталог -> кошик -> покупка -> бібліотека
+
+Запуск:
+    python benchmark.py [--games 10000] [--users 50] [--flows 200] [--concurrency 8]
+    python benchmark.py --mode http --workers 2      # через serve.py по HTTP
+    python benchmark.py --output new.json --compare old.json
+
+Створює тимчасову базу з синтетичним каталогом на --games ігор і --users
+покупцями (generate_data.py). Кожен потік грає віртуальних покупців: логін, головна,
+кілька сторінок /api/games, пошук, додавання в кошик, /cart, checkout,
+/library, повторний перегляд головної (з If-None-Match, як браузер),
+вихід. Режим test - Flask test client у процесі (без мережі), http -
+справжній сервер serve.py і http.client.
+
+Друкує p50/p95/p99 і запити/с для кожного маршруту. --output зберігає
+результат у JSON, --compare показує зміну p95 відносно іншого запуску.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+import generate_data
+from loadtest import HERE, free_port, wait_for_port
+from storage import Storage
+
+PASSWORD = 'bench-password'
+
+
+def prepare_database(path, games, users, iterations, seed=1):
+    """База з синтетичним каталогом і покупцями bench0..benchN"""
+    storage = Storage(path)
+    generate_data.load(storage, games, users, seed=seed, password=PASSWORD,
+                       iterations=iterations, prefix='bench')
+    storage.pool.close()
+    return list(generate_data.usernames(users, 'bench'))
+
+
+class TestClient:
+    """Клієнт через Flask test client (cookie зберігає сам)"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, data=None, headers=None):
+        response = self.client.open(path, method=method, data=data, headers=headers or {})
+        response.close()
+        return response.status_code, response.headers
+
+
+class HTTPClient:
+    """Клієнт через http.client з keep-alive і cookie сесії"""
+
+    def __init__(self, port):
+        self.port = port
+        self.conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        self.cookie = ''
+
+    def request(self, method, path, data=None, headers=None):
+        headers = dict(headers or {}, **{'Accept-Encoding': 'gzip'})
+        body = None
+        if data is not None:
+            body = urllib.parse.urlencode(data)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookie:
+            headers['Cookie'] = self.cookie
+        self.conn.request(method, path, body, headers)
+        response = self.conn.getresponse()
+        response.read()
+        cookie = response.getheader('Set-Cookie')
+        if cookie:
+            self.cookie = cookie.split(';', 1)[0]
+        if response.getheader('Connection', '').lower() == 'close':
+            self.conn.close()
+        return response.status, response.headers
+
+
+class Recorder:
+    """Затримки по маршрутах (потокобезпечно)"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.not_modified = {}
+        self._lock = threading.Lock()
+
+    def call(self, client, name, method, path, data=None, headers=None):
+        started = time.perf_counter()
+        try:
+            status, response_headers = client.request(method, path, data, headers)
+        except Exception:
+            status, response_headers = 599, {}
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.latencies.setdefault(name, []).append(elapsed)
+            if status >= 400:
+                self.errors[name] = self.errors.get(name, 0) + 1
+            elif status == 304:
+                self.not_modified[name] = self.not_modified.get(name, 0) + 1
+        return status, response_headers
+
+
+def shopper_flow(client, recorder, username, games, rng):
+    """Один візит покупця"""
+    recorder.call(client, 'POST /login', 'POST', '/login', {'username': username, 'password': PASSWORD})
+    recorder.call(client, 'GET /', 'GET', '/')
+
+    cursor = None
+    for _ in range(2):
+        path = '/api/games?html=1' + (f'&cursor={cursor}' if cursor else '')
+        recorder.call(client, 'GET /api/games', 'GET', path)
+        cursor = rng.randint(1, max(1, games - 50))
+    query = urllib.parse.quote(rng.choice(generate_data.NOUNS).lower())
+    recorder.call(client, 'GET /api/search', 'GET', f'/api/search?q={query}')
+
+    for game_id in rng.sample(range(1, games + 1), min(3, games)):
+        recorder.call(client, 'POST /add-to-cart/<id>', 'POST', f'/add-to-cart/{game_id}')
+    recorder.call(client, 'GET /cart', 'GET', '/cart')
+    recorder.call(client, 'POST /checkout', 'POST', '/checkout')
+    recorder.call(client, 'GET /library', 'GET', '/library')
+    # Повернення на головну, потім ще раз: браузер надсилає If-None-Match
+    _, headers = recorder.call(client, 'GET /', 'GET', '/')
+    etag = headers.get('ETag')
+    recorder.call(client, 'GET / (revisit)', 'GET', '/', headers={'If-None-Match': etag} if etag else None)
+    recorder.call(client, 'POST /logout', 'POST', '/logout')
+
+
+def run_flows(make_client, usernames, games, flows, concurrency, seed=1):
+    recorder = Recorder()
+    counter = iter(range(flows))
+    lock = threading.Lock()
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        client = make_client()
+        while True:
+            with lock:
+                flow = next(counter, None)
+            if flow is None:
+                return
+            shopper_flow(client, recorder, usernames[flow % len(usernames)], games, rng)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, time.perf_counter() - started
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+def summarize(recorder, wall):
+    routes = {}
+    for name, values in sorted(recorder.latencies.items()):
+        values = sorted(values)
+        routes[name] = {
+            'count': len(values),
+            'errors': recorder.errors.get(name, 0),
+            'not_modified': recorder.not_modified.get(name, 0),
+            'rps': len(values) / wall,
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p95_ms': percentile(values, 0.95) * 1000,
+            'p99_ms': percentile(values, 0.99) * 1000,
+        }
+    total = sum(route['count'] for route in routes.values())
+    return {'wall_s': wall, 'requests': total, 'rps': total / wall, 'routes': routes}
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result, baseline=None):
+    header = f'{"route":<26} {"count":>6} {"err":>4} {"304":>4} {"req/s":>7} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}'
+    print(header + ('   p95 vs base' if baseline else ''))
+    for name, route in result['routes'].items():
+        line = (f'{name:<26} {route["count"]:>6} {route["errors"]:>4} {route["not_modified"]:>4} {route["rps"]:>7.1f} '
+                f'{route["p50_ms"]:>8.2f} {route["p95_ms"]:>8.2f} {route["p99_ms"]:>8.2f}')
+        old = (baseline or {}).get('routes', {}).get(name)
+        if old and old['p95_ms']:
+            line += f'   {(route["p95_ms"] / old["p95_ms"] - 1) * 100:+7.1f}%'
+        print(line)
+    print(f'total: {result["requests"]} requests in {result["wall_s"]:.1f} s = {result["rps"]:.0f} req/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shopper-flow benchmark for steam_clone')
+    parser.add_argument('--mode', default='test', choices=['test', 'http'])
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--flows', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=2, help='server workers (http mode)')
+    parser.add_argument('--server', default='auto', choices=['auto', 'gunicorn', 'prefork', 'single'])
+    parser.add_argument('--kdf-iterations', type=int, default=1000,
+                        help='PBKDF2 iterations for bench users (real default is 200000)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='save results to this JSON file')
+    parser.add_argument('--compare', help='JSON results of a previous run')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    db_path = os.path.join(tmp, 'steam.db')
+    started = time.perf_counter()
+    usernames = prepare_database(db_path, args.games, args.users, args.kdf_iterations, args.seed)
+    print(f'prepared {args.games} games, {args.users} users in {time.perf_counter() - started:.1f} s')
+
+    settings = {
+        'DATABASE': db_path,
+        'SESSION_BACKEND': 'sqlite',
+        'SESSION_DB': os.path.join(tmp, 'sessions.db'),
+        'PASSWORD_ITERATIONS': args.kdf_iterations,
+        'LOGIN_RATE_PER_MINUTE': 10 ** 6,
+        'LOG_LEVEL': 'ERROR',
+    }
+
+    if args.mode == 'test':
+        from app import create_app
+        app = create_app(settings)
+        recorder, wall = run_flows(lambda: TestClient(app), usernames, args.games,
+                                   args.flows, args.concurrency, args.seed)
+    else:
+        port = free_port()
+        env = dict(os.environ,
+                   STEAM_DB=db_path,
+                   STEAM_SESSION_BACKEND='sqlite',
+                   STEAM_SESSION_DB=settings['SESSION_DB'],
+                   STEAM_PASSWORD_ITERATIONS=str(args.kdf_iterations),
+                   STEAM_LOGIN_RATE=str(10 ** 6),
+                   STEAM_LOG_LEVEL='ERROR')
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(HERE, 'serve.py'), '--bind', f'127.0.0.1:{port}',
+             '--workers', str(args.workers), '--server', args.server],
+            cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_port(port)
+            time.sleep(1)
+            recorder, wall = run_flows(lambda: HTTPClient(port), usernames, args.games,
+                                       args.flows, args.concurrency, args.seed)
+        finally:
+            process.terminate()
+            process.wait()
+
+    result = summarize(recorder, wall)
+    result['meta'] = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'args': vars(args),
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        print(f'baseline: {baseline.get("meta", {}).get("revision")}')
+    print_report(result, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
+        print(f'saved {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Збірка статичних файлів магазину
+
+Запуск: python build_static.py [--static static] [--width 600]
+
+Для кожного файлу з static/ створює копію з хешем вмісту в імені
+(static/dist/style.3f2a9c1b04.css), стиснені варіанти .gz/.br для
+текстових файлів і зменшені WebP/AVIF-мініатюри для зображень.
+Відповідність імен записується у static/dist/manifest.json, з якого
+читає хелпер static_url() (assets.py).
+
+Pillow та brotli - необов'язкові: без них мініатюри або .br не
+створюються, решта збірки працює.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+DIST_DIR = 'dist'
+MANIFEST = 'manifest.json'
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.html')
+IMAGES = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:10]
+
+
+def fingerprinted(rel_path, digest, suffix=None):
+    """images/bg3.jpg -> images/bg3.<hash>.jpg (або .<hash>.w600.webp)"""
+    root, ext = os.path.splitext(rel_path)
+    if suffix:
+        return f'{root}.{digest}.{suffix}'
+    return f'{root}.{digest}{ext}'
+
+
+def compress_variants(path):
+    """Створити path.gz та path.br поруч з файлом"""
+    with open(path, 'rb') as file:
+        data = file.read()
+    with open(path + '.gz', 'wb') as file:
+        file.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as file:
+            file.write(brotli.compress(data, quality=11))
+
+
+def image_formats():
+    if Image is None:
+        return []
+    return [fmt for fmt in ('avif', 'webp') if features.check(fmt)]
+
+
+def make_thumbnails(src, dist, rel_path, digest, width):
+    """Зменшені копії зображення у сучасних форматах"""
+    thumbs = {}
+    formats = image_formats()
+    if not formats:
+        return thumbs
+    with Image.open(src) as image:
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            target = fingerprinted(rel_path, digest, f'w{width}.{fmt}')
+            image.save(os.path.join(dist, target), fmt.upper(), quality=70)
+            thumbs[fmt] = target
+    return thumbs
+
+
+def build(static_dir, width=600):
+    dist = os.path.join(static_dir, DIST_DIR)
+    if os.path.isdir(dist):
+        shutil.rmtree(dist)
+
+    manifest = {'files': {}, 'thumbs': {}}
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [name for name in dirs if os.path.join(root, name) != dist]
+        for name in sorted(files):
+            src = os.path.join(root, name)
+            rel_path = os.path.relpath(src, static_dir).replace(os.sep, '/')
+            digest = file_hash(src)
+            target = fingerprinted(rel_path, digest)
+            target_path = os.path.join(dist, target)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            shutil.copyfile(src, target_path)
+            manifest['files'][rel_path] = target
+
+            ext = os.path.splitext(name)[1].lower()
+            if ext in COMPRESSIBLE:
+                compress_variants(target_path)
+            elif ext in IMAGES:
+                thumbs = make_thumbnails(src, dist, rel_path, digest, width)
+                if thumbs:
+                    manifest['thumbs'][rel_path] = thumbs
+
+    with open(os.path.join(dist, MANIFEST), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='Fingerprint and compress static files')
+    parser.add_argument('--static', default=os.path.join(here, 'static'))
+    parser.add_argument('--width', type=int, default=600, help='thumbnail width, px')
+    args = parser.parse_args()
+
+    manifest = build(args.static, args.width)
+    dist = os.path.join(args.static, DIST_DIR)
+    for rel_path, target in manifest['files'].items():
+        original = os.path.getsize(os.path.join(args.static, rel_path))
+        sizes = [f'{os.path.getsize(os.path.join(dist, target))} B']
+        for variant in ('.gz', '.br'):
+            if os.path.exists(os.path.join(dist, target + variant)):
+                sizes.append(f'{variant[1:]} {os.path.getsize(os.path.join(dist, target + variant))} B')
+        for fmt, thumb in manifest['thumbs'].get(rel_path, {}).items():
+            sizes.append(f'{fmt} {os.path.getsize(os.path.join(dist, thumb))} B')
+        print(f'{rel_path}: {original} B -> ' + ', '.join(sizes))
+    if Image is None:
+        print('Pillow is not installed: thumbnails skipped')
+    if brotli is None:
+        print('brotli is not installed: .br variants skipped')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import bisect
+
+
+class Catalog:
+    """Каталог ігор з індексами за id та за тегами
+
+    Порядок ігор при обході - порядок додавання (його зберігає словник _by_id).
+    """
+
+    def __init__(self, games=()):
+        self._by_id = {}
+        self._by_tag = {}
+        self._sorted_ids = []
+        self._versions = {}
+        self._listeners = []
+        self._price_listeners = []
+        self.version = 0
+        for game in games:
+            self.add(game)
+
+    def add(self, game):
+        """Додати (або замінити) гру в каталозі"""
+        game_id = game['id']
+        if game_id in self._by_id:
+            self.remove(game_id)
+        self._by_id[game_id] = game
+        bisect.insort(self._sorted_ids, game_id)
+        for tag in game.get('tags', []):
+            self._by_tag.setdefault(tag, set()).add(game_id)
+        self._touch(game_id)
+
+    def remove(self, game_id):
+        """Видалити гру з каталогу"""
+        game = self._by_id.pop(game_id, None)
+        if game is None:
+            return
+        del self._sorted_ids[bisect.bisect_left(self._sorted_ids, game_id)]
+        for tag in game.get('tags', []):
+            ids = self._by_tag.get(tag)
+            if ids is not None:
+                ids.discard(game_id)
+                if not ids:
+                    del self._by_tag[tag]
+        self._touch(game_id)
+
+    def update_price(self, game_id, original_price=None, discount=None, current_price=None):
+        """Змінити ціну або знижку гри"""
+        game = self._by_id[game_id]
+        if original_price is not None:
+            game['original_price'] = original_price
+        if discount is not None:
+            game['discount'] = discount
+        if current_price is not None:
+            game['current_price'] = current_price
+        self._touch(game_id)
+
+    def apply_prices(self, changes):
+        """Записати готові ціни {id: (discount, current_price)} (рушій цін)
+
+        Зміна лише ціни не стосується пошуку, тому звичайні on_change
+        слухачі не викликаються - лише on_prices_change зі списком id.
+        """
+        changed = []
+        for game_id, (discount, current_price) in changes.items():
+            game = self._by_id.get(game_id)
+            if game is None:
+                continue
+            game['discount'] = discount
+            game['current_price'] = current_price
+            self.version += 1
+            self._versions[game_id] = self.version
+            changed.append(game_id)
+        for callback in self._price_listeners:
+            callback(changed)
+
+    def version_of(self, game_id):
+        """Версія гри (змінюється при кожній зміні гри)"""
+        return self._versions.get(game_id, 0)
+
+    def on_change(self, callback):
+        """Викликати callback(game_id) при зміні гри"""
+        self._listeners.append(callback)
+
+    def on_prices_change(self, callback):
+        """Викликати callback(список id) після apply_prices"""
+        self._price_listeners.append(callback)
+
+    def _touch(self, game_id):
+        self.version += 1
+        self._versions[game_id] = self.version
+        for callback in self._listeners:
+            callback(game_id)
+
+    def get(self, game_id):
+        """Отримати гру за id (або None)"""
+        return self._by_id.get(game_id)
+
+    def games_by_ids(self, game_ids):
+        """Список ігор за списком id (у порядку game_ids, невідомі пропускаються)"""
+        by_id = self._by_id
+        return [by_id[game_id] for game_id in game_ids if game_id in by_id]
+
+    def page(self, cursor=None, limit=24):
+        """Сторінка ігор після cursor (id останньої показаної гри)
+
+        Повертає (ігри, наступний cursor або None). Ігри впорядковані за id,
+        пошук початку сторінки - бінарний, тому час не залежить від розміру
+        каталогу.
+        """
+        start = 0 if cursor is None else bisect.bisect_right(self._sorted_ids, cursor)
+        ids = self._sorted_ids[start:start + limit]
+        next_cursor = ids[-1] if ids and start + limit < len(self._sorted_ids) else None
+        return self.games_by_ids(ids), next_cursor
+
+    def ids_with_tag(self, tag):
+        """Множина id ігор з даним тегом"""
+        return set(self._by_tag.get(tag, ()))
+
+    def games_with_tag(self, tag):
+        """Список ігор з даним тегом"""
+        return self.games_by_ids(sorted(self._by_tag.get(tag, ())))
+
+    def tags(self):
+        """Всі теги каталогу"""
+        return list(self._by_tag)
+
+    def __contains__(self, game_id):
+        return game_id in self._by_id
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
@@ -0,0 +1,207 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Типи, які варто стискати (зображення та архіви вже стиснені)
+COMPRESSIBLE = ('text/html', 'text/css', 'text/plain', 'text/javascript',
+                'application/json', 'application/javascript', 'image/svg+xml')
+
+
+def parse_accept_encoding(header):
+    """{кодування: q} з заголовка Accept-Encoding"""
+    result = {}
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        result[name.strip().lower()] = q
+    return result
+
+
+class GzipCompressor:
+    encoding = 'gzip'
+
+    def __init__(self, level):
+        # wbits=31 - формат gzip (заголовок + CRC)
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._zlib.compress(data)
+
+    def flush(self):
+        return self._zlib.flush()
+
+
+class BrotliCompressor:
+    encoding = 'br'
+
+    def __init__(self, level):
+        self._brotli = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._brotli.process(data)
+
+    def flush(self):
+        return self._brotli.finish()
+
+
+class CompressionMiddleware:
+    """WSGI middleware: стискає HTML/JSON відповіді gzip або brotli
+
+    Кодування обирається за Accept-Encoding (brotli, якщо встановлено і
+    клієнт його приймає). Відповіді менші за min_size не стискаються:
+    якщо Content-Length невідомий, перші шматки накопичуються лише до
+    min_size байт. Далі тіло стискається потоково, шматок за шматком,
+    тому велика сторінка не буферизується повністю.
+
+    Не чіпає відповіді, що вже мають Content-Encoding (precompressed
+    статика), 204/304, частини файлу (206, Content-Range), HEAD та
+    Cache-Control: no-transform.
+    """
+
+    def __init__(self, app, min_size=500, level=6, brotli_level=4):
+        self.app = app
+        self.min_size = min_size
+        self.level = level
+        self.brotli_level = brotli_level
+
+    def choose(self, environ):
+        """Клас компресора для запиту (або None)"""
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return None
+        accepted = parse_accept_encoding(environ.get('HTTP_ACCEPT_ENCODING'))
+        if brotli is not None and accepted.get('br', 0) > 0:
+            return BrotliCompressor
+        if accepted.get('gzip', 0) > 0:
+            return GzipCompressor
+        return None
+
+    def __call__(self, environ, start_response):
+        compressor_class = self.choose(environ)
+        if compressor_class is None:
+            return self.app(environ, start_response)
+
+        captured = {}
+
+        def capture(status, headers, exc_info=None):
+            if exc_info is not None:
+                # Помилка до початку тіла - віддаємо як є
+                captured['passthrough'] = True
+                return start_response(status, headers, exc_info)
+            captured['status'] = status
+            captured['headers'] = headers
+            return start_response_later
+
+        def start_response_later(data):
+            raise RuntimeError('CompressionMiddleware does not support write()')
+
+        app_iter = self.app(environ, capture)
+        if captured.get('passthrough'):
+            return app_iter
+        if 'status' in captured and not self._should_compress(captured['status'], captured['headers']):
+            # Віддаємо тіло як є (зберігає wsgi.file_wrapper для файлів)
+            start_response(captured['status'], captured['headers'])
+            return app_iter
+        return self._stream(app_iter, captured, compressor_class, start_response)
+
+    def _should_compress(self, status, headers):
+        if status[:3] in ('204', '206', '304') or int(status[:3]) < 200:
+            return False
+        values = {name.lower(): value for name, value in headers}
+        if 'content-encoding' in values or 'content-range' in values:
+            # Стиснення діапазону зламало б зміщення в Content-Range
+            return False
+        if 'no-transform' in values.get('cache-control', ''):
+            return False
+        mimetype = values.get('content-type', '').split(';', 1)[0].strip().lower()
+        if mimetype not in COMPRESSIBLE:
+            return False
+        length = values.get('content-length')
+        if length is not None and length.isdigit() and int(length) < self.min_size:
+            return False
+        return True
+
+    def _stream(self, app_iter, captured, compressor_class, start_response):
+        iterator = iter(app_iter)
+        try:
+            head = []
+            size = 0
+            if 'status' not in captured:
+                # Генератор викликає start_response лише на першому шматку
+                for chunk in iterator:
+                    head.append(chunk)
+                    size += len(chunk)
+                    break
+            if 'status' not in captured or captured.get('passthrough'):
+                # Відповідь про помилку (exc_info) або порожнє тіло без start_response -
+                # віддаємо як є, сервер сам обробить такий випадок
+                yield from head
+                yield from iterator
+                return
+            status, headers = captured['status'], captured['headers']
+            if not self._should_compress(status, headers):
+                start_response(status, headers)
+                yield from head
+                yield from iterator
+                return
+
+            # Накопичуємо початок тіла, поки не стане ясно, що воно >= min_size
+            if size < self.min_size:
+                for chunk in iterator:
+                    head.append(chunk)
+                    size += len(chunk)
+                    if size >= self.min_size:
+                        break
+                else:
+                    start_response(status, headers)
+                    yield from head
+                    return
+
+            start_response(status, self._compressed_headers(headers, compressor_class.encoding))
+            level = self.brotli_level if compressor_class is BrotliCompressor else self.level
+            compressor = compressor_class(level)
+            data = compressor.compress(b''.join(head))
+            if data:
+                yield data
+            for chunk in iterator:
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+            yield compressor.flush()
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+    @staticmethod
+    def _compressed_headers(headers, encoding):
+        result = []
+        vary = None
+        for name, value in headers:
+            lower = name.lower()
+            if lower in ('content-length', 'accept-ranges'):
+                # Довжина і діапазони стосуються нестисненого тіла
+                continue
+            if lower == 'vary':
+                vary = value
+                continue
+            if lower == 'etag' and not value.startswith('W/'):
+                # Стиснене тіло відрізняється побайтово - ETag стає слабким
+                value = 'W/' + value
+            result.append((name, value))
+        if vary is None:
+            vary = 'Accept-Encoding'
+        elif 'accept-encoding' not in vary.lower():
+            vary += ', Accept-Encoding'
+        result.append(('Vary', vary))
+        result.append(('Content-Encoding', encoding))
+        return result
@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+class Config:
+    """Налаштування застосунку (значення за замовчуванням - зі змінних оточення)"""
+
+    SECRET_KEY = os.environ.get('STEAM_SECRET_KEY', 'your-secret-key-change-it-make-it-random-12345')
+
+    # База даних: користувачі, ігри, баланси та покупки
+    DATABASE = os.environ.get('STEAM_DB', 'steam.db')
+    DATABASE_POOL_SIZE = _env_int('STEAM_DB_POOL', 5)
+
+    # Сховище сесій: 'memory' (один процес) або 'sqlite' (кілька процесів)
+    SESSION_BACKEND = os.environ.get('STEAM_SESSION_BACKEND', 'memory')
+    SESSION_DB = os.environ.get('STEAM_SESSION_DB', 'sessions.db')
+
+    # Рівень логування (None - WARNING, у debug - INFO)
+    LOG_LEVEL = os.environ.get('STEAM_LOG_LEVEL')
+
+    # Папка для профілів ?profile=1 (None - профілювання вимкнено)
+    PROFILE_DIR = os.environ.get('STEAM_PROFILE_DIR')
+    # Хто бачить /metrics і може профілювати: адреси чи мережі через кому
+    # (порожньо - ніхто)
+    METRICS_ALLOW = os.environ.get('STEAM_METRICS_ALLOW', '127.0.0.1,::1')
+
+    # Хешування паролів (PBKDF2) у пулі потоків
+    PASSWORD_ITERATIONS = _env_int('STEAM_PASSWORD_ITERATIONS', 200000)
+    PASSWORD_WORKERS = _env_int('STEAM_PASSWORD_WORKERS', 4)
+    PASSWORD_MAX_PENDING = _env_int('STEAM_PASSWORD_MAX_PENDING', 64)
+    # Скільки секунд пам'ятати успішно перевірений пароль
+    CREDENTIAL_CACHE_TTL = _env_int('STEAM_CREDENTIAL_CACHE_TTL', 60)
+    # Спроб входу з одного IP за хвилину
+    LOGIN_RATE_PER_MINUTE = _env_int('STEAM_LOGIN_RATE', 10)
+
+    # Як часто (секунд) перечитувати розпродажі та зміни цін з бази
+    SALES_POLL_INTERVAL = _env_int('STEAM_SALES_POLL', 30)
+
+    # Стиснення відповідей (0 - вимкнено, напр. якщо стискає nginx)
+    COMPRESS = _env_int('STEAM_COMPRESS', 1)
+    COMPRESS_MIN_SIZE = _env_int('STEAM_COMPRESS_MIN_SIZE', 500)
+    COMPRESS_LEVEL = _env_int('STEAM_COMPRESS_LEVEL', 6)
+    COMPRESS_BROTLI_LEVEL = _env_int('STEAM_COMPRESS_BROTLI_LEVEL', 4)
+
+    # Оформлення вітрини (різне для steam_clone і test_html, див. storefronts.py)
+    # STOREFRONT - назва вітрини в метриках і логах
+    STOREFRONT = 'steam_clone'
+    STATIC_FOLDER = 'static'
+    AVATARS = {}
+    LOGO_TEXT = None
+    LOGIN_QR_URL = 'https://upload.wikimedia.org/wikipedia/commons/2/2f/Rickrolling_QR_code.png'
+
+    # Розмір кешу карток ігор
+    FRAGMENT_CACHE_SIZE = _env_int('STEAM_FRAGMENT_CACHE', 5000)
+
+    # Async-версії сторінок під /async (потрібен flask[async]; під WSGI вони повільніші)
+    ASYNC_VIEWS = _env_int('STEAM_ASYNC_VIEWS', 0)
+
+
+class ServerConfig:
+    """Налаштування production-сервера (gunicorn.conf.py, serve.py)"""
+
+    bind = os.environ.get('STEAM_BIND', '127.0.0.1:8000')
+    workers = _env_int('STEAM_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+    threads = _env_int('STEAM_THREADS', 4)
+    keepalive = _env_int('STEAM_KEEPALIVE', 5)
+    timeout = _env_int('STEAM_TIMEOUT', 30)
+    backlog = _env_int('STEAM_BACKLOG', 2048)
+    # Перезапуск воркера після N запитів (захист від витоків пам'яті)
+    max_requests = _env_int('STEAM_MAX_REQUESTS', 10000)
+    max_requests_jitter = _env_int('STEAM_MAX_REQUESTS_JITTER', 1000)
@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+
+from jinja2 import BytecodeCache
+from markupsafe import Markup
+
+
+class FragmentCache:
+    """LRU-кеш відрендерених фрагментів HTML"""
+
+    def __init__(self, max_entries=5000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._keys_by_game = {}
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            html = self._data.get(key)
+            if html is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+        html = render()
+        with self._lock:
+            self._data[key] = html
+            self._keys_by_game.setdefault(key[0], set()).add(key)
+            while len(self._data) > self.max_entries:
+                old_key, _ = self._data.popitem(last=False)
+                self._forget(old_key)
+        return html
+
+    def invalidate(self, game_id):
+        """Видалити всі фрагменти гри (перший елемент ключа - id гри)"""
+        with self._lock:
+            for key in self._keys_by_game.pop(game_id, ()):
+                self._data.pop(key, None)
+
+    def invalidate_many(self, game_ids):
+        with self._lock:
+            for game_id in game_ids:
+                for key in self._keys_by_game.pop(game_id, ()):
+                    self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._keys_by_game.clear()
+
+    def _forget(self, key):
+        keys = self._keys_by_game.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_game[key[0]]
+
+    def __len__(self):
+        return len(self._data)
+
+
+class MemoryBytecodeCache(BytecodeCache):
+    """Байткод шаблонів у пам'яті, спільний для кількох jinja-середовищ
+
+    Кожен Flask-застосунок має своє середовище, але з цим кешем шаблон
+    компілюється один раз на процес. Jinja перевіряє контрольну суму
+    джерела, тому різні шаблони з однаковою назвою не плутаються.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def load_bytecode(self, bucket):
+        with self._lock:
+            data = self._data.get(bucket.key)
+        if data is not None:
+            bucket.bytecode_from_string(data)
+
+    def dump_bytecode(self, bucket):
+        data = bucket.bytecode_to_string()
+        with self._lock:
+            self._data[bucket.key] = data
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class GameCards:
+    """Рендер карток ігор через кеш фрагментів
+
+    Картка однакова для всіх користувачів, крім стану "куплено", тому
+    ключ кешу - (id гри, версія гри в каталозі, purchased). Зміна ціни чи
+    знижки в каталозі збільшує версію, і старий фрагмент видаляється.
+    """
+
+    def __init__(self, app, catalog, max_entries=5000):
+        self.app = app
+        self.catalog = catalog
+        self.cache = FragmentCache(max_entries)
+        catalog.on_change(self.cache.invalidate)
+        catalog.on_prices_change(self.cache.invalidate_many)
+
+    def render(self, game, purchased):
+        purchased = bool(purchased)
+        key = (game['id'], self.catalog.version_of(game['id']), purchased)
+        return self.cache.get_or_render(key, lambda: Markup(
+            self.app.jinja_env.get_template('_game_card.html').render(game=game, purchased=purchased)
+        ))
+
+
+def setup_game_cards(app, catalog, max_entries=5000):
+    """Зареєструвати в шаблонах функцію game_card(game, purchased)"""
+    cards = GameCards(app, catalog, max_entries)
+    app.jinja_env.globals['game_card'] = cards.render
+    return cards
@@ -0,0 +1,177 @@
+"""Генератор великого синтетичного каталогу та користувачів з покупками
+
+Запуск: python generate_data.py --db steam.db --games 1000000 --users 100000
+
+Ігри, користувачі та покупки генеруються ледаче (генератори) і пишуться
+в базу пакетами по --batch рядків, тому пам'ять не залежить від N: у
+пам'яті тримається лише пакет та масив цін (4 байти на гру).
+
+Розподіли наближені до реального магазину: багато дешевих інді, мало
+дорогих ААА, ~8% безкоштовних; знижка у ~25% ігор; теги з "довгим
+хвостом" (популярні трапляються частіше); покупки зміщені до популярних
+ігор (менші id), кількість покупок на користувача - експоненційна.
+
+Усі згенеровані користувачі мають однаковий пароль (--password), хеш
+рахується один раз.
+"""
+import argparse
+import itertools
+import random
+import time
+from array import array
+
+from passwords import hash_password
+from storage import Storage
+
+ADJECTIVES = ('Dark', 'Lost', 'Eternal', 'Broken', 'Silent', 'Crimson', 'Hidden', 'Iron', 'Frozen',
+              'Wild', 'Last', 'Ancient', 'Neon', 'Hollow', 'Savage', 'Golden', 'Infinite', 'Cursed')
+NOUNS = ('Kingdom', 'Legends', 'Souls', 'Empire', 'Frontier', 'Dungeon', 'Horizon', 'Galaxy', 'Island',
+         'Citadel', 'Odyssey', 'Tactics', 'Chronicles', 'Survivors', 'Racer', 'Farm', 'Knights', 'Ruins')
+NUMERALS = ('2', '3', 'II', 'III', 'Remastered', 'Deluxe')
+SETTINGS = ('у постапокаліптичному світі', 'у середньовічному королівстві', 'на далекій космічній станції',
+            'у кіберпанк-мегаполісі', 'на загубленому острові', 'у світі темного фентезі')
+GOALS = ('Досліджуйте', 'Захистіть', 'Відбудуйте', 'Підкоріть', 'Врятуйте', 'Переживіть')
+OBJECTS = ('величезний відкритий світ', 'свою колонію', 'останнє місто', 'древні підземелля',
+           'зоряну імперію', 'команду найманців')
+# Теги у порядку популярності (ваги - закон Ципфа)
+TAGS = ('Інді', 'Екшн', 'Пригоди', 'RPG', 'Стратегія', 'Симулятор', 'Казуальна', 'Відкритий світ',
+        'Мультиплеєр', 'Шутер', 'Фентезі', 'Sci-Fi', 'Виживання', 'Пазл', 'Платформер', 'Хорор',
+        'Покрокова', 'Гонки', 'Кооператив', 'Конкурентний', 'Рогалик', 'Спорт')
+TAG_WEIGHTS = [1 / rank for rank in range(1, len(TAGS) + 1)]
+PRICES = (49, 99, 149, 199, 249, 299, 379, 449, 549, 699, 899, 1099, 1299, 1499, 1699, 1999)
+PRICE_WEIGHTS = (6, 10, 10, 12, 9, 10, 7, 7, 6, 5, 4, 3, 3, 3, 2, 2)
+DISCOUNTS = (10, 15, 20, 25, 33, 40, 50, 60, 75, 80, 90)
+DISCOUNT_WEIGHTS = (8, 6, 10, 10, 6, 6, 10, 4, 5, 2, 1)
+IMAGES = ('cyberpunk.jpg', 'eldenring.jpg', 'cs2.jpg', 'bg3.jpg')
+
+
+def generate_games(count, rng, start_id=1):
+    """Генератор count ігор з id від start_id"""
+    for game_id in range(start_id, start_id + count):
+        title = f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}'
+        if rng.random() < 0.15:
+            title += ' ' + rng.choice(NUMERALS)
+
+        if rng.random() < 0.08:
+            original = 0
+        else:
+            original = rng.choices(PRICES, PRICE_WEIGHTS)[0]
+        discount = 0
+        if original and rng.random() < 0.25:
+            discount = rng.choices(DISCOUNTS, DISCOUNT_WEIGHTS)[0]
+
+        tags = set()
+        tag_count = rng.randint(2, 5)
+        while len(tags) < tag_count:
+            tags.add(rng.choices(TAGS, TAG_WEIGHTS)[0])
+
+        yield {
+            'id': game_id,
+            'title': title,
+            'description': f'{rng.choice(GOALS)} {rng.choice(OBJECTS)} {rng.choice(SETTINGS)}.',
+            'image': IMAGES[game_id % len(IMAGES)],
+            'tags': sorted(tags),
+            'original_price': original,
+            'discount': discount,
+            'current_price': original * (100 - discount) // 100,
+        }
+
+
+def usernames(count, prefix='player'):
+    """Логіни згенерованих користувачів: player000, player001, ..."""
+    width = len(str(count))
+    return (f'{prefix}{index:0{width}d}' for index in range(count))
+
+
+def generate_users(count, rng, password_hash, prefix='player'):
+    """Генератор пар (логін, дані) для count користувачів"""
+    for username in usernames(count, prefix):
+        # Баланс - логнормальний, медіана ~2000 ₴
+        balance = int(rng.lognormvariate(7.6, 0.8)) // 10 * 10
+        yield username, {'password': password_hash, 'avatar': '', 'balance': balance}
+
+
+def generate_purchases(usernames, prices, rng, mean=5, max_per_user=200):
+    """Генератор трійок (логін, id гри, ціна); prices[i] - ціна гри з id i+1"""
+    games = len(prices)
+    for username in usernames:
+        count = min(max_per_user, games, int(rng.expovariate(1 / mean)))
+        owned = set()
+        while len(owned) < count:
+            # Популярні ігри (менші id) купують частіше
+            owned.add(int(games * rng.random() ** 3) + 1)
+        for game_id in sorted(owned):
+            yield username, game_id, prices[game_id - 1]
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def load(storage, games=0, users=0, purchases_per_user=5, batch_size=10000, seed=1,
+         password='password', iterations=200000, prefix='player', progress=None):
+    """Згенерувати дані і записати в storage пакетами; повертає кількість рядків"""
+    rng = random.Random(seed)
+    storage.migrate()
+    prices = array('i')
+    counts = {'games': 0, 'users': 0, 'purchases': 0}
+
+    def report(kind, batch):
+        counts[kind] += len(batch)
+        if progress:
+            progress(kind, counts[kind])
+
+    for batch in batched(generate_games(games, rng), batch_size):
+        storage.save_games(batch)
+        prices.extend(game['current_price'] for game in batch)
+        report('games', batch)
+
+    password_hash = hash_password(password, iterations)
+    for batch in batched(generate_users(users, rng, password_hash, prefix), batch_size):
+        storage.save_users(batch)
+        report('users', batch)
+        if prices:
+            # Покупки пишемо одразу для цього пакета користувачів
+            names = [username for username, _ in batch]
+            for purchases in batched(generate_purchases(names, prices, rng, purchases_per_user),
+                                     batch_size):
+                storage.add_purchases(purchases)
+                report('purchases', purchases)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a large synthetic store database')
+    parser.add_argument('--db', default='steam.db')
+    parser.add_argument('--games', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--purchases', type=float, default=5, help='mean purchases per user')
+    parser.add_argument('--batch', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--iterations', type=int, default=200000, help='PBKDF2 iterations')
+    parser.add_argument('--prefix', default='player', help='username prefix')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+
+    def progress(kind, count):
+        print(f'\r{kind}: {count} ({time.perf_counter() - started:.1f} s)', end='', flush=True)
+
+    storage = Storage(args.db)
+    counts = load(storage, args.games, args.users, args.purchases, args.batch, args.seed,
+                  args.password, args.iterations, args.prefix, progress)
+    print()
+    elapsed = time.perf_counter() - started
+    rows = sum(counts.values())
+    print(f'{counts["games"]} games, {counts["users"]} users, {counts["purchases"]} purchases '
+          f'in {elapsed:.1f} s ({rows / elapsed:.0f} rows/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+# Налаштування gunicorn: gunicorn -c gunicorn.conf.py wsgi:app
+# Значення - з config.ServerConfig (змінні оточення STEAM_WORKERS, STEAM_THREADS, ...)
+import os
+
+# Кілька воркерів - потрібне спільне сховище сесій
+os.environ.setdefault('STEAM_SESSION_BACKEND', 'sqlite')
+
+from config import ServerConfig
+
+bind = ServerConfig.bind
+workers = ServerConfig.workers
+threads = ServerConfig.threads
+worker_class = 'gthread'
+keepalive = ServerConfig.keepalive
+timeout = ServerConfig.timeout
+backlog = ServerConfig.backlog
+max_requests = ServerConfig.max_requests
+max_requests_jitter = ServerConfig.max_requests_jitter
+
+# Кожен воркер відкриває власні з'єднання SQLite після fork
+preload_app = False
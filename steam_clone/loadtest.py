@@ -0,0 +1,111 @@
+"""Навантажувальний тест: як росте пропускна здатність з кількістю воркерів
+
+Запуск: python loadtest.py [--workers 1,2,4] [--clients 16] [--duration 10]
+
+Для кожної кількості воркерів запускає serve.py на окремій тимчасовій
+базі, логінить клієнтів і протягом duration секунд ганяє запити по
+маршрутах магазину (/, /cart, /library, /api/games). Клієнти - окремі
+процеси з keep-alive з'єднаннями. В кінці друкує таблицю запитів/с.
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROUTES = ('/', '/cart', '/library', '/api/games?limit=24')
+USERS = (('admin', 'password123'), ('user1', '123456'), ('gamer', 'qwerty'))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def client(port, user_index, duration):
+    """Один клієнт: логін, потім запити по колу до кінця тесту"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    username, password = USERS[user_index % len(USERS)]
+    body = urllib.parse.urlencode({'username': username, 'password': password})
+    conn.request('POST', '/login', body, {'Content-Type': 'application/x-www-form-urlencoded'})
+    response = conn.getresponse()
+    response.read()
+    cookie = response.getheader('Set-Cookie', '').split(';', 1)[0]
+
+    count = errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        conn.request('GET', ROUTES[count % len(ROUTES)], headers={'Cookie': cookie})
+        response = conn.getresponse()
+        response.read()
+        if response.status != 200:
+            errors += 1
+        count += 1
+        if response.getheader('Connection', '').lower() == 'close':
+            conn.close()
+    conn.close()
+    return count, errors
+
+
+def run(workers, clients, duration, server):
+    port = free_port()
+    tmp = tempfile.mkdtemp()
+    env = dict(os.environ,
+               STEAM_DB=os.path.join(tmp, 'steam.db'),
+               STEAM_SESSION_BACKEND='sqlite',
+               STEAM_SESSION_DB=os.path.join(tmp, 'sessions.db'),
+               STEAM_LOGIN_RATE='100000')
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, 'serve.py'), '--bind', f'127.0.0.1:{port}',
+         '--workers', str(workers), '--server', server],
+        cwd=HERE, env=env, stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        time.sleep(1)
+        with multiprocessing.Pool(clients) as pool:
+            results = pool.starmap(client, [(port, i, duration) for i in range(clients)])
+    finally:
+        process.terminate()
+        process.wait()
+    total = sum(count for count, _ in results)
+    errors = sum(err for _, err in results)
+    return total / duration, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Requests/second vs worker count')
+    parser.add_argument('--workers', default='1,2,4')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--server', default='auto', choices=['auto', 'gunicorn', 'prefork', 'single'])
+    args = parser.parse_args()
+
+    print(f'{"workers":>8} {"req/s":>10} {"errors":>8}')
+    baseline = None
+    for workers in (int(w) for w in args.workers.split(',')):
+        rps, errors = run(workers, args.clients, args.duration, args.server)
+        baseline = baseline or rps
+        print(f'{workers:>8} {rps:>10.0f} {errors:>8}   x{rps / baseline:.2f}')
+
+
+if __name__ == '__main__':
+    main()
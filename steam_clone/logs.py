@@ -0,0 +1,117 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+from flask import current_app, g, has_app_context, has_request_context, request, session
+
+# Спільний логер процесу: на ньому обробник черги. Кожна вітрина пише в
+# дочірній логер steam.<STOREFRONT> зі своїм рівнем (див. app_logger)
+logger = logging.getLogger('steam')
+
+
+class RequestContextFilter(logging.Filter):
+    """Додає до запису контекст запиту: користувач, маршрут, тривалість"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.user = session.get('username')
+            record.route = request.endpoint
+            record.method = request.method
+            record.storefront = current_app.config['STOREFRONT']
+            started = g.get('request_started')
+            if started is not None:
+                record.latency_ms = round((time.perf_counter() - started) * 1000, 3)
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler без форматування в потоці запиту
+
+    Стандартний QueueHandler.prepare() форматує повідомлення ще до того, як
+    покласти його в чергу. Тут запис кладеться як є, а все форматування
+    виконує фоновий потік QueueListener.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Один JSON-об'єкт на рядок"""
+
+    fields = ('storefront', 'user', 'route', 'method', 'latency_ms')
+
+    def format(self, record):
+        data = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'event': record.getMessage(),
+        }
+        for name in self.fields:
+            value = getattr(record, name, None)
+            if value is not None:
+                data[name] = value
+        data.update(getattr(record, 'data', None) or {})
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+_listener = None
+
+
+def setup_logging(app, stream=None):
+    """Підключити асинхронне логування до застосунку
+
+    Рівень - app.config['LOG_LEVEL'] (див. config.Config), якщо не задано -
+    WARNING, у debug - INFO (у звичайній роботі події запитів не пишуться).
+    Рівень задається логеру цієї вітрини, тож кілька застосунків в одному
+    процесі (storefronts.py) не перекривають налаштування одне одного.
+    """
+    global _listener
+
+    level = app.config['LOG_LEVEL'] or ('INFO' if app.debug else 'WARNING')
+    app_log = app.extensions['logger'] = logging.getLogger(f'{logger.name}.{app.config["STOREFRONT"]}')
+    app_log.setLevel(level)
+
+    if _listener is None:
+        logger.propagate = False
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter())
+
+        log_queue = queue.SimpleQueue()
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(RequestContextFilter())
+        logger.addHandler(handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, output)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def log_request(response):
+        if app_log.isEnabledFor(logging.INFO):
+            log_event('request', status=response.status_code, path=request.path)
+        return response
+
+
+def app_logger():
+    """Логер вітрини поточного застосунку (поза застосунком - спільний)"""
+    if has_app_context():
+        return current_app.extensions.get('logger', logger)
+    return logger
+
+
+def log_event(event, level=logging.INFO, **data):
+    """Записати структуровану подію (нічого не робить, якщо рівень вимкнено)"""
+    log = app_logger()
+    if log.isEnabledFor(level):
+        log.log(level, event, extra={'data': data})
@@ -0,0 +1,201 @@
+import bisect
+import cProfile
+import ipaddress
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, abort, before_render_template, current_app, g, request, template_rendered
+
+# Межі кошиків гістограм (секунди)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """Гістограма з фіксованими кошиками та кількома мітками"""
+
+    def __init__(self, name, help_text, labels, buckets=BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, *label_values):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        for values, (counts, total, count) in items:
+            label = ','.join(f'{name}="{value}"' for name, value in zip(self.labels, values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{label}}} {total:.6f}')
+            lines.append(f'{self.name}_count{{{label}}} {count}')
+        return lines
+
+
+class Counter:
+    """Лічильник з кількома мітками"""
+
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + 1
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, count in items:
+            label = ','.join(f'{name}="{value}"' for name, value in zip(self.labels, values))
+            lines.append(f'{self.name}{{{label}}} {count}')
+        return lines
+
+
+# Метрики спільні для процесу; вітрини (storefronts.py) розрізняє мітка storefront
+REQUEST_LATENCY = Histogram('steam_request_duration_seconds', 'Request latency by endpoint',
+                            ('storefront', 'endpoint'))
+TEMPLATE_RENDER = Histogram('steam_template_render_seconds', 'Template render time',
+                            ('storefront', 'template'))
+SESSION_TIME = Histogram('steam_session_seconds', 'Server-side session open/save time',
+                         ('storefront', 'op'))
+STAGE_TIME = Histogram('steam_stage_seconds', 'Time spent in request stages', ('storefront', 'stage'))
+REQUESTS = Counter('steam_requests_total', 'Requests by endpoint, method and status',
+                   ('storefront', 'endpoint', 'method', 'status'))
+
+ALL_METRICS = (REQUEST_LATENCY, TEMPLATE_RENDER, SESSION_TIME, STAGE_TIME, REQUESTS)
+
+
+@contextmanager
+def timed(stage):
+    """Виміряти час етапу обробки запиту (наприклад, вибірки з каталогу)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_TIME.observe(time.perf_counter() - started, current_app.config['STOREFRONT'], stage)
+
+
+def render_metrics():
+    """Всі метрики у текстовому форматі Prometheus"""
+    lines = []
+    for metric in ALL_METRICS:
+        lines.extend(metric.expose())
+    return '\n'.join(lines) + '\n'
+
+
+class TimedSessionInterface:
+    """Обгортка SessionInterface, що вимірює час відкриття/збереження сесії"""
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def open_session(self, app, request):
+        started = time.perf_counter()
+        try:
+            return self.inner.open_session(app, request)
+        finally:
+            SESSION_TIME.observe(time.perf_counter() - started, app.config['STOREFRONT'], 'open')
+
+    def save_session(self, app, session, response):
+        started = time.perf_counter()
+        try:
+            return self.inner.save_session(app, session, response)
+        finally:
+            SESSION_TIME.observe(time.perf_counter() - started, app.config['STOREFRONT'], 'save')
+
+
+def parse_networks(value):
+    """Мережі з рядка "127.0.0.1,10.0.0.0/8" (порожній рядок - жодної)"""
+    return tuple(ipaddress.ip_network(item.strip(), strict=False) for item in value.split(',') if item.strip())
+
+
+def client_allowed(networks):
+    """Чи входить адреса клієнта поточного запиту в одну з мереж"""
+    try:
+        address = ipaddress.ip_address(request.remote_addr or '')
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def setup_metrics(app, profile_dir=None):
+    """Підключити збір метрик та endpoint /metrics
+
+    /metrics і профілювання доступні лише клієнтам з мереж METRICS_ALLOW
+    (за замовчуванням - лише localhost), решта отримує 404.
+
+    Якщо задано profile_dir (або STEAM_PROFILE_DIR), запит з параметром
+    ?profile=1 виконується під cProfile, а результат зберігається у файл
+    .prof у цій папці (ім'я файлу - у заголовку X-Profile-File).
+    """
+    profile_dir = profile_dir or os.environ.get('STEAM_PROFILE_DIR')
+    storefront = app.config['STOREFRONT']
+    allowed = parse_networks(app.config['METRICS_ALLOW'])
+    app.session_interface = TimedSessionInterface(app.session_interface)
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+        if profile_dir and request.args.get('profile') and client_allowed(allowed):
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('metrics_started', None)
+        endpoint = request.endpoint or 'unknown'
+        if started is not None and endpoint != 'metrics':
+            REQUEST_LATENCY.observe(time.perf_counter() - started, storefront, endpoint)
+        REQUESTS.inc(storefront, endpoint, request.method, response.status_code)
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            os.makedirs(profile_dir, exist_ok=True)
+            path = os.path.join(profile_dir, f'{endpoint}-{time.time():.0f}-{os.getpid()}.prof')
+            profiler.dump_stats(path)
+            response.headers['X-Profile-File'] = path
+        return response
+
+    def on_before_render(sender, template, context, **extra):
+        g.setdefault('render_started', []).append(time.perf_counter())
+
+    def on_rendered(sender, template, context, **extra):
+        stack = g.get('render_started')
+        if stack:
+            TEMPLATE_RENDER.observe(time.perf_counter() - stack.pop(), storefront, template.name)
+
+    before_render_template.connect(on_before_render, app, weak=False)
+    template_rendered.connect(on_rendered, app, weak=False)
+
+    @app.route('/metrics')
+    def metrics():
+        """Метрики у форматі Prometheus"""
+        if not client_allowed(allowed):
+            abort(404)
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
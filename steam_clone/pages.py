@@ -0,0 +1,180 @@
+"""Спільна логіка сторінок магазину для sync (app.py) та async (async_views.py) маршрутів
+
+Маршрут лише збирає стан користувача (UserState) - послідовно або через
+asyncio.gather, - а перевірка ETag/304, рендер, метрики та формат JSON
+тут однакові для обох.
+"""
+import hashlib
+import logging
+from collections import namedtuple
+
+from flask import current_app, jsonify, make_response, render_template, request, session
+
+from logs import app_logger, log_event
+from metrics import timed
+
+# Кількість ігор на одній сторінці магазину
+PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+# Стан користувача, який показують сторінки
+UserState = namedtuple('UserState', ['balance', 'cart', 'purchased', 'current_user'])
+
+
+def services():
+    return current_app.extensions['steam']
+
+
+def check_auth():
+    """Перевірка авторизації"""
+    if 'username' not in session:
+        return False
+    return True
+
+
+def user_profile(username, user):
+    """Дані користувача для шаблонів (user - рядок з бази або None)"""
+    if user:
+        return {
+            'username': username,
+            'avatar': current_app.config['AVATARS'].get(username, user['avatar'])
+        }
+    return None
+
+
+def get_page_args():
+    """Параметри сторінки з запиту: cursor (id останньої гри) та limit"""
+    cursor = request.args.get('cursor', type=int)
+    limit = request.args.get('limit', PAGE_SIZE, type=int)
+    return cursor, max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def page_etag(*state):
+    """ETag сторінки для поточного користувача (None - сторінку не кешувати)
+
+    Складається з версії каталогу (ціни, ігри), версії збірки та шаблонів,
+    URL і стану користувача, що показується на сторінці (state). Сторінку
+    з flash-повідомленням кешувати не можна - воно показується один раз.
+    """
+    if '_flashes' in session:
+        return None
+    storefront = current_app.extensions['storefront']
+    key = repr((storefront.page_version, services().catalog.version, request.full_path,
+                session.get('username'), state))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def not_modified(etag):
+    """Порожня відповідь 304, якщо у клієнта вже є ця версія (інакше None)"""
+    if etag is None or not request.if_none_match.contains_weak(etag):
+        return None
+    return with_etag(current_app.response_class(status=304), etag)
+
+
+def with_etag(body, etag):
+    """Відповідь з ETag; браузер щоразу перепитує сервер (no-cache)"""
+    response = make_response(body)
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def index_page(state):
+    """Головна сторінка магазину"""
+    catalog = services().catalog
+    purchased_ids = set(state.purchased)
+    cart_count = len(state.cart)
+
+    log_event('index', logging.DEBUG, balance=state.balance, games=len(catalog), cart_items=cart_count)
+
+    # Нічого не змінилося з минулого перегляду - 304 без рендеру
+    etag = page_etag(state.balance, cart_count, sorted(purchased_ids), state.current_user)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    # Лише перша сторінка, решта - через /api/games (нескінченна прокрутка)
+    cursor, limit = get_page_args()
+    games, next_cursor = catalog.page(cursor, limit)
+
+    try:
+        html = render_template('index.html',
+                               games=games,
+                               next_cursor=next_cursor,
+                               page_size=limit,
+                               cart_count=cart_count,
+                               balance=state.balance,
+                               purchased_ids=purchased_ids,
+                               current_user=state.current_user)
+        return with_etag(html, etag)
+    except Exception as e:
+        app_logger().exception('index_render_failed')
+        return f"<h1>Error loading page</h1><pre>{e}</pre>"
+
+
+def cart_page(state):
+    """Сторінка кошика"""
+    etag = page_etag(state.cart, state.balance, state.current_user)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    with timed('catalog'):
+        cart_games = services().catalog.games_by_ids(state.cart)
+
+    total = services().pricing.total(game['id'] for game in cart_games)
+
+    try:
+        html = render_template('cart.html',
+                               games=cart_games,
+                               total=total,
+                               cart_count=len(cart_games),
+                               balance=state.balance,
+                               current_user=state.current_user)
+        return with_etag(html, etag)
+    except Exception as e:
+        return f"<h1>Error loading cart</h1><pre>{e}</pre>"
+
+
+def library_page(state):
+    """Бібліотека куплених ігор"""
+    cart_count = len(state.cart)
+    etag = page_etag(state.purchased, state.balance, cart_count, state.current_user)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    with timed('catalog'):
+        purchased_games = services().catalog.games_by_ids(state.purchased)
+
+    try:
+        html = render_template('library.html',
+                               games=purchased_games,
+                               balance=state.balance,
+                               cart_count=cart_count,
+                               current_user=state.current_user)
+        return with_etag(html, etag)
+    except Exception as e:
+        return f"<h1>Error loading library</h1><pre>{e}</pre>"
+
+
+def games_page(purchased):
+    """Сторінка каталогу у JSON (?cursor=&limit=, ?html=1 - з готовими картками)"""
+    purchased_ids = set(purchased)
+    etag = page_etag(sorted(purchased_ids))
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    cursor, limit = get_page_args()
+    games, next_cursor = services().catalog.page(cursor, limit)
+
+    data = {
+        'games': [dict(game, purchased=game['id'] in purchased_ids) for game in games],
+        'next_cursor': next_cursor,
+    }
+    if request.args.get('html'):
+        game_cards = current_app.extensions['storefront'].game_cards
+        data['html'] = ''.join(game_cards.render(game, game['id'] in purchased_ids) for game in games)
+    return with_etag(jsonify(data), etag)
@@ -0,0 +1,124 @@
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ALGORITHM = 'pbkdf2_sha256'
+
+
+class Overloaded(Exception):
+    """Черга перевірки паролів переповнена"""
+
+
+def hash_password(password, iterations=200000, salt=None):
+    """Хеш пароля у форматі pbkdf2_sha256$ітерації$сіль$хеш"""
+    salt = salt or base64.b64encode(os.urandom(16)).decode('ascii').rstrip('=')
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('ascii'), iterations)
+    return f'{ALGORITHM}${iterations}${salt}${base64.b64encode(digest).decode("ascii")}'
+
+
+def check_password(stored, password):
+    """Перевірити пароль проти збереженого хешу (порівняння за сталий час)"""
+    try:
+        algorithm, iterations, salt, _ = stored.split('$', 3)
+    except ValueError:
+        return False
+    if algorithm != ALGORITHM:
+        return False
+    candidate = hash_password(password, int(iterations), salt)
+    return hmac.compare_digest(candidate, stored)
+
+
+def is_hashed(value):
+    return value.startswith(ALGORITHM + '$')
+
+
+class PasswordHasher:
+    """Перевірка паролів в обмеженому пулі потоків
+
+    hashlib.pbkdf2_hmac відпускає GIL, тому потоки справді рахують хеші
+    паралельно і не блокують інші запити. Кількість задач у черзі обмежена:
+    при переповненні verify() одразу кидає Overloaded замість того, щоб
+    накопичувати очікуючі логіни.
+
+    Успішні перевірки кешуються на ttl секунд (ключ - HMAC від логіна,
+    пароля та збереженого хешу), тому повторний логін не рахує KDF знову.
+    """
+
+    def __init__(self, iterations=200000, workers=4, max_pending=64, cache_ttl=60):
+        self.iterations = iterations
+        self.cache_ttl = cache_ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='kdf')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._cache = {}
+        self._cache_key = os.urandom(32)
+        self._lock = threading.Lock()
+        # Хеш для неіснуючих користувачів: час відповіді не видає, чи є такий логін
+        self._dummy = hash_password(os.urandom(8).hex(), iterations)
+
+    def hash(self, password):
+        return self._run(hash_password, password, self.iterations)
+
+    def verify(self, stored, password, username=''):
+        """True, якщо пароль правильний; stored=None - користувача немає"""
+        if stored is None:
+            self._run(check_password, self._dummy, password)
+            return False
+
+        key = hmac.new(self._cache_key, f'{username}\0{password}\0{stored}'.encode('utf-8'),
+                       hashlib.sha256).digest()
+        now = time.monotonic()
+        with self._lock:
+            expires = self._cache.get(key)
+            if expires is not None and expires > now:
+                return True
+
+        ok = self._run(check_password, stored, password)
+        if ok:
+            with self._lock:
+                if len(self._cache) > 10000:
+                    self._cache = {k: v for k, v in self._cache.items() if v > now}
+                self._cache[key] = now + self.cache_ttl
+        return ok
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise Overloaded()
+        try:
+            return self._executor.submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+class RateLimiter:
+    """Обмеження кількості спроб на ключ (IP) - token bucket"""
+
+    def __init__(self, per_minute=10, burst=None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst or per_minute
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return False
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > 100000:
+                self._cleanup(now)
+            return True
+
+    def _cleanup(self, now):
+        # Повні відра можна забути - вони еквівалентні новому ключу
+        full = self.capacity / self.rate
+        self._buckets = {key: value for key, value in self._buckets.items() if now - value[1] < full}
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import namedtuple
+
+# Розпродаж: знижка у відсотках на [starts, ends) (unix-час).
+# tag=None і game_ids=None - розпродаж на весь магазин.
+Sale = namedtuple('Sale', ['id', 'name', 'discount', 'starts', 'ends', 'tag', 'game_ids'])
+
+
+def discounted(original_price, discount):
+    """Ціна зі знижкою (округлення вниз, як у початкових даних)"""
+    return original_price * (100 - discount) // 100
+
+
+class PricingEngine:
+    """Таблиця актуальних цін з урахуванням розпродажів
+
+    Ціна гри = базова ціна з каталогу або, якщо діє розпродаж з більшою
+    знижкою, оригінальна ціна з цією знижкою (знижки не сумуються).
+    Таблиця {id: ціна} рахується наперед і перераховується лише на межах
+    розпродажів (початок чи кінець) або при зміні списку розпродажів, тому
+    запит лише читає готові ціни: сума кошика - O(розмір кошика).
+
+    Нові ціни записуються в каталог (catalog.apply_prices), щоб шаблони
+    показували знижку, а кеш карток оновився.
+
+    Базові ціни змінюються в спільній базі (storage.update_price);
+    load_price_changes(after) повертає зміни після запису after, і кожен
+    процес застосовує їх при тому самому опитуванні, що й розпродажі.
+    """
+
+    def __init__(self, catalog, load_sales=lambda: [], poll_interval=30, clock=time.time,
+                 load_price_changes=lambda after: [], price_cursor=0):
+        self.catalog = catalog
+        self.load_sales = load_sales
+        self.load_price_changes = load_price_changes
+        self._price_cursor = price_cursor
+        self.poll_interval = poll_interval
+        self.clock = clock
+        # Базові ціни: id -> (original_price, discount, current_price)
+        self._base = {game['id']: (game['original_price'], game['discount'], game['current_price'])
+                      for game in catalog}
+        self._sales = []
+        self._prices = {}
+        self._discounts = {}
+        self._next_boundary = 0
+        self._next_poll = 0
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.refresh(force=True)
+
+    # --- Читання ---
+
+    def price(self, game_id):
+        """Актуальна ціна гри або None, якщо гри немає в каталозі цього процесу"""
+        price = self._prices.get(game_id)
+        if price is None:
+            game = self.catalog.get(game_id)
+            return game['current_price'] if game else None
+        return price
+
+    def prices_for(self, game_ids):
+        """{id: ціна} для списку ігор
+
+        Невідомі цьому процесу ігри (додані в базу після запуску) пропускаються -
+        для них storage.checkout бере ціну з бази, а не 0.
+        """
+        prices = {}
+        for game_id in game_ids:
+            price = self.price(game_id)
+            if price is not None:
+                prices[game_id] = price
+        return prices
+
+    def total(self, game_ids):
+        """Сума за списком ігор - O(len(game_ids)); невідомі ігри не враховуються"""
+        return sum(self.prices_for(game_ids).values())
+
+    def active_sales(self, now=None):
+        now = self.clock() if now is None else now
+        return [sale for sale in self._sales if sale.starts <= now < sale.ends]
+
+    # --- Оновлення ---
+
+    def refresh(self, now=None, force=False):
+        """Перерахувати таблицю, якщо настала межа розпродажу (дешево, якщо ні)
+
+        Раз на poll_interval секунд перечитує список розпродажів і журнал
+        змін базових цін (інші процеси могли їх змінити). Повертає True,
+        якщо таблицю перераховано.
+        """
+        now = self.clock() if now is None else now
+        if not force and now < self._next_boundary and now < self._next_poll:
+            return False
+        # Перераховує один потік; інші поки читають стару таблицю
+        if not self._lock.acquire(blocking=force):
+            return False
+        try:
+            changed = ()
+            if now >= self._next_poll or force:
+                self._next_poll = now + self.poll_interval
+                sales = sorted(self.load_sales())
+                if sales != self._sales:
+                    self._sales = sales
+                    force = True
+                changed = self._apply_base_changes(self.load_price_changes(self._price_cursor))
+            if not force and now < self._next_boundary:
+                if not changed:
+                    return False
+                self._recompute(now, only=changed)
+                return True
+            self._recompute(now)
+            return True
+        finally:
+            self._lock.release()
+
+    def set_sales(self, sales):
+        """Замінити список розпродажів і одразу перерахувати ціни"""
+        with self._lock:
+            self._sales = sorted(sales)
+            self._recompute(self.clock())
+
+    def _apply_base_changes(self, changes):
+        """Нові базові ціни з журналу змін; повертає id змінених ігор"""
+        changed = []
+        for change in changes:
+            self._price_cursor = change['id']
+            game_id = change['game_id']
+            if self.catalog.get(game_id) is None:
+                continue
+            self._base[game_id] = (change['original_price'], change['discount'], change['current_price'])
+            self.catalog.update_price(game_id, original_price=change['original_price'])
+            changed.append(game_id)
+        return tuple(dict.fromkeys(changed))
+
+    def _recompute(self, now, only=None):
+        active = [sale for sale in self._sales if sale.starts <= now < sale.ends]
+        boundaries = [t for sale in self._sales for t in (sale.starts, sale.ends) if t > now]
+        self._next_boundary = min(boundaries, default=float('inf'))
+
+        # Найбільша знижка розпродажів: на весь магазин та для окремих ігор
+        store_wide = 0
+        extra = {}
+        for sale in active:
+            if sale.tag is None and sale.game_ids is None:
+                store_wide = max(store_wide, sale.discount)
+                continue
+            ids = set(sale.game_ids or ())
+            if sale.tag is not None:
+                ids |= self.catalog.ids_with_tag(sale.tag)
+            for game_id in ids:
+                if sale.discount > extra.get(game_id, 0):
+                    extra[game_id] = sale.discount
+
+        prices = dict(self._prices) if only else {}
+        discounts = dict(self._discounts) if only else {}
+        changes = {}
+        for game_id in (only or self._base):
+            original, base_discount, base_price = self._base[game_id]
+            discount = max(store_wide, extra.get(game_id, 0))
+            if discount > base_discount:
+                price = discounted(original, discount)
+            else:
+                discount, price = base_discount, base_price
+            prices[game_id] = price
+            discounts[game_id] = discount
+            if self._prices.get(game_id) != price or self._discounts.get(game_id) != discount:
+                changes[game_id] = (discount, price)
+
+        # Заміна посилань атомарна: читачі бачать або стару, або нову таблицю
+        self._prices = prices
+        self._discounts = discounts
+        self.refreshes += 1
+        if changes:
+            self.catalog.apply_prices(changes)
@@ -0,0 +1,198 @@
+import bisect
+import heapq
+import re
+import threading
+from array import array
+from collections import OrderedDict
+
+# Українські слова можуть містити апостроф (м'ята, п'ять)
+TOKEN_RE = re.compile(r"\w+(?:['’ʼ]\w+)*")
+
+# Вага збігу в різних полях гри
+FIELD_WEIGHTS = (('title', 5), ('tags', 3), ('description', 1))
+
+# Коротше за це останнє слово шукається як ціле слово, а не як префікс:
+# префікс з однієї літери охоплює пів словника
+MIN_PREFIX = 2
+
+
+def tokenize(text):
+    """Розбити текст на слова у нижньому регістрі"""
+    return TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """Інвертований індекс ігор за назвою, описом та тегами
+
+    Запит - слова через пробіл, всі слова мають бути знайдені (AND).
+    Останнє слово шукається як префікс (пошук під час набору тексту),
+    якщо воно не коротше за MIN_PREFIX; префікс розгортається в усі слова
+    словника, тож загальна кількість збігів завжди точна.
+    Фільтр за тегами - перетин множин id, починаючи з найменшої.
+    """
+
+    def __init__(self, games=()):
+        self._postings = {}     # слово -> {game_id: вага}
+        self._vocabulary = []   # впорядковані слова (для префіксного пошуку)
+        self._tags = {}         # тег -> множина game_id
+        self._game_terms = {}   # game_id -> (слова, теги) для видалення
+        self._lock = threading.RLock()
+        self._version = 0
+        # Кеш запитів: ключ -> (версія, всього збігів, id, бали) - лише перші
+        # результати в компактних масивах; розмір обмежений сумою id у кеші
+        self._results = OrderedDict()
+        self._cached_ids = 0
+        self.max_cached_queries = 1000
+        self.max_cached_ids = 200000
+        self.cache_depth = 200
+        for game in games:
+            self.add(game)
+
+    def add(self, game):
+        """Проіндексувати гру (повторне додавання оновлює індекс)"""
+        game_id = game['id']
+        weights = {}
+        for field, weight in FIELD_WEIGHTS:
+            value = game.get(field) or ''
+            text = ' '.join(value) if isinstance(value, list) else value
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0) + weight
+        tags = tuple(game.get('tags', ()))
+
+        with self._lock:
+            self.remove(game_id)
+            for token, weight in weights.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    bisect.insort(self._vocabulary, token)
+                postings[game_id] = weight
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(game_id)
+            self._game_terms[game_id] = (tuple(weights), tags)
+            self._version += 1
+
+    def remove(self, game_id):
+        """Видалити гру з індексу"""
+        with self._lock:
+            terms = self._game_terms.pop(game_id, None)
+            if terms is None:
+                return
+            self._version += 1
+            tokens, tags = terms
+            for token in tokens:
+                postings = self._postings[token]
+                postings.pop(game_id, None)
+                if not postings:
+                    del self._postings[token]
+                    del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+            for tag in tags:
+                ids = self._tags.get(tag)
+                if ids is not None:
+                    ids.discard(game_id)
+                    if not ids:
+                        del self._tags[tag]
+
+    def sync(self, catalog, game_id):
+        """Оновити гру з каталогу (для catalog.on_change)"""
+        game = catalog.get(game_id)
+        if game is None:
+            self.remove(game_id)
+        else:
+            self.add(game)
+
+    def _prefix_postings(self, prefix):
+        """Об'єднані postings всіх слів, що починаються з prefix"""
+        if len(prefix) < MIN_PREFIX:
+            return self._postings.get(prefix, {})
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\U0010ffff')
+        merged = {}
+        for token in self._vocabulary[start:end]:
+            for game_id, weight in self._postings[token].items():
+                # Точний збіг важить більше за префіксний
+                score = weight * 2 if token == prefix else weight
+                if score > merged.get(game_id, 0):
+                    merged[game_id] = score
+        return merged
+
+    def search(self, query='', tags=(), offset=0, limit=20):
+        """Пошук: повертає (список (game_id, бал), загальна кількість)
+
+        Перші max(cache_depth, offset + limit) результатів запиту кешуються
+        до наступної зміни індексу, тому наступні сторінки - лише зріз.
+        Ранжування йде без блокування індексу: повільний запит не тримає
+        інші пошуки.
+        """
+        tokens = tuple(tokenize(query))
+        key = (tokens, tuple(sorted(set(tags))))
+        end = offset + limit
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and cached[0] == self._version:
+                _, total, ids, scores = cached
+                if end <= len(ids) or len(ids) == total:
+                    self._results.move_to_end(key)
+                    return list(zip(ids[offset:end], scores[offset:end])), total
+
+        version, hits, total = self._rank_unlocked(tokens, key[1], max(end, self.cache_depth))
+        ids = array('i', (game_id for game_id, _ in hits))
+        scores = array('i', (score for _, score in hits))
+        with self._lock:
+            if version == self._version and len(ids) <= self.max_cached_ids:
+                self._cache(key, (version, total, ids, scores))
+        return hits[offset:end], total
+
+    def _cache(self, key, entry):
+        old = self._results.pop(key, None)
+        if old is not None:
+            self._cached_ids -= len(old[2])
+        self._results[key] = entry
+        self._cached_ids += len(entry[2])
+        while self._cached_ids > self.max_cached_ids or len(self._results) > self.max_cached_queries:
+            _, evicted = self._results.popitem(last=False)
+            self._cached_ids -= len(evicted[2])
+
+    def _rank_unlocked(self, tokens, tags, depth, attempts=3):
+        """_rank без блокування; якщо індекс змінився під час обходу - ще раз
+
+        Повертає (версія індексу, результати, всього). Після кількох невдалих
+        спроб (індекс змінюється безперервно) ранжує під блокуванням.
+        """
+        for _ in range(attempts):
+            version = self._version
+            try:
+                hits, total = self._rank(tokens, tags, depth)
+            except (RuntimeError, KeyError):
+                # Індекс змінився під час обходу (паралельний add/remove)
+                continue
+            if version == self._version:
+                return version, hits, total
+        with self._lock:
+            return (self._version,) + self._rank(tokens, tags, depth)
+
+    def _rank(self, tokens, tags, depth):
+        """Перші depth збігів запиту за балом (і за id при рівності) та кількість усіх"""
+        term_postings = [self._postings.get(token, {}) for token in tokens[:-1]]
+        if tokens:
+            term_postings.append(self._prefix_postings(tokens[-1]))
+        tag_sets = [self._tags.get(tag, set()) for tag in tags]
+
+        if not term_postings and not tag_sets:
+            return [], 0
+
+        # Перетин: перебираємо найменшу множину, решту лише перевіряємо
+        sources = sorted(term_postings + tag_sets, key=len)
+        smallest, rest = sources[0], sources[1:]
+        candidates = [game_id for game_id in smallest
+                      if all(game_id in source for source in rest)]
+
+        scored = [
+            (-sum(postings[game_id] for postings in term_postings), game_id)
+            for game_id in candidates
+        ]
+        top = heapq.nsmallest(depth, scored) if depth < len(scored) else sorted(scored)
+        return [(game_id, -score) for score, game_id in top], len(scored)
+
+    def __len__(self):
+        return len(self._game_terms)
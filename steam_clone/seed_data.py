@@ -0,0 +1,64 @@
+# Початкові дані магазину (імпортуються в базу даних при першому запуску)
+
+# База користувачів (логін: {пароль, аватарка, стартовий баланс})
+USERS = {
+    'admin': {
+        'password': 'password123',
+        'avatar': 'https://avatars.steamstatic.com/fef49e7fa7e1997310d705b2a6158ff8dc1cdfeb_full.jpg',
+        'balance': 10000
+    },
+    'user1': {
+        'password': '123456',
+        'avatar': 'https://avatars.steamstatic.com/fef49e7fa7e1997310d705b2a6158ff8dc1cdfeb_full.jpg',
+        'balance': 5000
+    },
+    'gamer': {
+        'password': 'qwerty',
+        'avatar': 'https://avatars.steamstatic.com/fef49e7fa7e1997310d705b2a6158ff8dc1cdfeb_full.jpg',
+        'balance': 15000
+    }
+}
+
+# Дані про ігри
+GAMES = [
+    {
+        'id': 1,
+        'title': 'Cyberpunk 2077',
+        'description': 'Футуристична RPG з відкритим світом у Night City. Створіть свого персонажа та досліджуйте величезний мегаполіс майбутнього.',
+        'image': 'cyberpunk.jpg',
+        'tags': ['RPG', 'Відкритий світ', 'Sci-Fi'],
+        'original_price': 1499,
+        'discount': 40,
+        'current_price': 899
+    },
+    {
+        'id': 2,
+        'title': 'Elden Ring',
+        'description': 'Епічна action-RPG від FromSoftware. Досліджуйте величезний фантастичний світ та долайте складних босів.',
+        'image': 'eldenring.jpg',
+        'tags': ['RPG', 'Екшн', 'Фентезі'],
+        'original_price': 1699,
+        'discount': 25,
+        'current_price': 1274
+    },
+    {
+        'id': 3,
+        'title': 'Counter-Strike 2',
+        'description': 'Легендарний тактичний шутер нового покоління. Працюйте в команді та перемагайте противників.',
+        'image': 'cs2.jpg',
+        'tags': ['Шутер', 'Мультиплеєр', 'Конкурентний'],
+        'original_price': 0,
+        'discount': 0,
+        'current_price': 0
+    },
+    {
+        'id': 4,
+        'title': 'Baldurs Gate 3',
+        'description': 'Епічна RPG за мотивами Dungeons & Dragons. Створюйте свою історію у світі магії та пригод.',
+        'image': 'bg3.jpg',
+        'tags': ['RPG', 'Пригоди', 'Покрокова'],
+        'original_price': 1799,
+        'discount': 15,
+        'current_price': 1529
+    }
+]
@@ -0,0 +1,132 @@
+"""Запуск магазину на багатопроцесному сервері
+
+Запуск: python serve.py [--bind 127.0.0.1:8000] [--workers 4] [--threads 4]
+
+Якщо встановлено gunicorn - використовується він (gthread-воркери).
+Інакше на Linux/macOS запускається власний pre-fork сервер: один
+слухаючий сокет і N дочірніх процесів з багатопотоковим сервером
+Werkzeug. На Windows - waitress (якщо є) або Werkzeug у одному процесі.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+
+# Кілька процесів - потрібне спільне сховище сесій
+os.environ.setdefault('STEAM_SESSION_BACKEND', 'sqlite')
+
+from config import ServerConfig
+
+
+def run_gunicorn(args):
+    from gunicorn.app.base import BaseApplication
+
+    class StoreApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', args.bind)
+            self.cfg.set('workers', args.workers)
+            self.cfg.set('threads', args.threads)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('keepalive', ServerConfig.keepalive)
+            self.cfg.set('timeout', ServerConfig.timeout)
+            self.cfg.set('backlog', ServerConfig.backlog)
+            self.cfg.set('max_requests', ServerConfig.max_requests)
+            self.cfg.set('max_requests_jitter', ServerConfig.max_requests_jitter)
+
+        def load(self):
+            from wsgi import app
+            return app
+
+    StoreApplication().run()
+
+
+def run_prefork(args):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    host, port = args.bind.rsplit(':', 1)
+    listener = socket.create_server((host, int(port)), backlog=ServerConfig.backlog)
+    listener.set_inheritable(True)
+
+    # HTTP/1.1 - щоб працював keep-alive
+    WSGIRequestHandler.protocol_version = 'HTTP/1.1'
+
+    children = []
+    for _ in range(args.workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            # Без access-логу werkzeug (синхронний вивід на кожен запит)
+            logging.getLogger('werkzeug').setLevel(logging.WARNING)
+            # Застосунок створюється вже в дочірньому процесі (свої з'єднання SQLite)
+            from wsgi import app
+            server = make_server(host, int(port), app, threaded=True, fd=listener.fileno())
+            server.timeout = ServerConfig.keepalive
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    print(f'Serving on http://{args.bind} with {args.workers} worker processes (werkzeug pre-fork)')
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    # SIGTERM батьківському процесу зупиняє і всі дочірні
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def run_single_process(args):
+    from wsgi import app
+
+    host, port = args.bind.rsplit(':', 1)
+    try:
+        from waitress import serve
+    except ImportError:
+        print(f'Serving on http://{args.bind} (werkzeug, one process, threaded)')
+        app.run(host=host, port=int(port), threaded=True, debug=False, use_reloader=False)
+    else:
+        print(f'Serving on http://{args.bind} (waitress, {args.threads} threads)')
+        serve(app, host=host, port=int(port), threads=args.threads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the store on a production server')
+    parser.add_argument('--bind', default=ServerConfig.bind)
+    parser.add_argument('--workers', type=int, default=ServerConfig.workers)
+    parser.add_argument('--threads', type=int, default=ServerConfig.threads)
+    parser.add_argument('--server', choices=['auto', 'gunicorn', 'prefork', 'single'], default='auto')
+    args = parser.parse_args()
+
+    server = args.server
+    if server == 'auto':
+        try:
+            import gunicorn  # noqa: F401
+            server = 'gunicorn'
+        except ImportError:
+            server = 'prefork' if hasattr(os, 'fork') else 'single'
+
+    if server == 'gunicorn':
+        sys.argv = sys.argv[:1]
+        run_gunicorn(args)
+    elif server == 'prefork':
+        run_prefork(args)
+    else:
+        run_single_process(args)
+
+
+if __name__ == '__main__':
+    main()
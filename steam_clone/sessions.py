@@ -0,0 +1,231 @@
+import itertools
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+
+class MemorySessionBackend:
+    """Сховище сесій у пам'яті процесу з LRU-витісненням"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, raw = item
+            if expires is not None and expires < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        expires = time.time() + ttl if ttl else None
+        raw = json.dumps(value)
+        with self._lock:
+            self._data[key] = (expires, raw)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def update(self, key, func, ttl=None):
+        """Атомарно змінити значення: func(старе або None) -> нове"""
+        with self._lock:
+            item = self._data.get(key)
+            old = None
+            if item is not None and (item[0] is None or item[0] >= time.time()):
+                old = json.loads(item[1])
+            value = func(old)
+            expires = time.time() + ttl if ttl else None
+            self._data[key] = (expires, json.dumps(value))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def cleanup(self):
+        """Видалити прострочені сесії"""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (expires, _) in self._data.items()
+                       if expires is not None and expires < now]
+            for key in expired:
+                del self._data[key]
+
+
+class SQLiteSessionBackend:
+    """Сховище сесій у файлі SQLite (спільне для кількох процесів)"""
+
+    def __init__(self, path='sessions.db'):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' expires REAL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires)')
+        conn.commit()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT value, expires FROM sessions WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires = row
+        if expires is not None and expires < time.time():
+            self.delete(key)
+            return None
+        return json.loads(value)
+
+    def set(self, key, value, ttl=None):
+        expires = time.time() + ttl if ttl else None
+        self._connect().execute(
+            'INSERT OR REPLACE INTO sessions (key, value, expires) VALUES (?, ?, ?)',
+            (key, json.dumps(value), expires)
+        )
+
+    def update(self, key, func, ttl=None):
+        """Атомарно змінити значення: func(старе або None) -> нове
+
+        BEGIN IMMEDIATE блокує запис для інших процесів, тому читання і
+        запис не перемежовуються з паралельними змінами того самого ключа.
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT value, expires FROM sessions WHERE key = ?', (key,)
+            ).fetchone()
+            old = None
+            if row is not None and (row[1] is None or row[1] >= time.time()):
+                old = json.loads(row[0])
+            value = func(old)
+            expires = time.time() + ttl if ttl else None
+            conn.execute(
+                'INSERT OR REPLACE INTO sessions (key, value, expires) VALUES (?, ?, ?)',
+                (key, json.dumps(value), expires)
+            )
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return value
+
+    def delete(self, key):
+        self._connect().execute('DELETE FROM sessions WHERE key = ?', (key,))
+
+    def cleanup(self):
+        """Видалити прострочені сесії"""
+        self._connect().execute(
+            'DELETE FROM sessions WHERE expires IS NOT NULL AND expires < ?', (time.time(),)
+        )
+
+
+def create_backend(kind='memory', path='sessions.db', max_entries=10000):
+    """Створити сховище сесій за назвою ('memory' або 'sqlite')"""
+    if kind == 'memory':
+        return MemorySessionBackend(max_entries)
+    if kind == 'sqlite':
+        return SQLiteSessionBackend(path)
+    raise ValueError(f'Unknown session backend: {kind}')
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Сесія, дані якої зберігаються на сервері, а в cookie лише id"""
+
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.old_sid = None
+
+    def regenerate(self):
+        """Новий id сесії (після входу/виходу), щоб старий cookie більше не діяв"""
+        if self.old_sid is None and not self.new:
+            self.old_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.modified = True
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Flask SessionInterface поверх сховища сесій"""
+
+    key_prefix = 'session_'
+
+    def __init__(self, backend, cleanup_every=1000):
+        self.backend = backend
+        # Прострочені сесії видаляються раз на cleanup_every записів
+        self.cleanup_every = cleanup_every
+        self._writes = itertools.count(1)
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self.backend.get(self.key_prefix + sid)
+            if data is not None:
+                return ServerSideSession(data, sid=sid)
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.old_sid is not None:
+            # Після regenerate() дані під старим id (можливо, підкинутим) видаляємо
+            self.backend.delete(self.key_prefix + session.old_sid)
+
+        if not session:
+            if session.modified and not session.new:
+                self.backend.delete(self.key_prefix + session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.modified:
+            ttl = app.permanent_session_lifetime.total_seconds()
+            self.backend.set(self.key_prefix + session.sid, dict(session), ttl=ttl)
+            if next(self._writes) % self.cleanup_every == 0:
+                self.backend.cleanup()
+
+        if session.new or session.modified or self.should_set_cookie(app, session):
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
@@ -0,0 +1,394 @@
+import queue
+import sqlite3
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+
+# Міграції схеми: номер версії = індекс + 1 (PRAGMA user_version)
+MIGRATIONS = [
+    """
+    CREATE TABLE users (
+        username TEXT PRIMARY KEY,
+        password TEXT NOT NULL,
+        avatar TEXT NOT NULL DEFAULT '',
+        start_balance INTEGER NOT NULL DEFAULT 0,
+        balance INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE games (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        description TEXT NOT NULL DEFAULT '',
+        image TEXT NOT NULL DEFAULT '',
+        original_price INTEGER NOT NULL DEFAULT 0,
+        discount INTEGER NOT NULL DEFAULT 0,
+        current_price INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE game_tags (
+        game_id INTEGER NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        tag TEXT NOT NULL,
+        PRIMARY KEY (game_id, position)
+    );
+    CREATE INDEX idx_game_tags_tag ON game_tags(tag, game_id);
+    CREATE TABLE purchases (
+        username TEXT NOT NULL REFERENCES users(username),
+        game_id INTEGER NOT NULL REFERENCES games(id),
+        price INTEGER NOT NULL DEFAULT 0,
+        purchased_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE UNIQUE INDEX idx_purchases_user_game ON purchases(username, game_id);
+    """,
+    """
+    CREATE TABLE sales (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        discount INTEGER NOT NULL,
+        starts REAL NOT NULL,
+        ends REAL NOT NULL,
+        tag TEXT,
+        game_ids TEXT
+    );
+    CREATE INDEX idx_sales_ends ON sales(ends);
+    """,
+    """
+    CREATE TABLE price_changes (
+        id INTEGER PRIMARY KEY,
+        game_id INTEGER NOT NULL REFERENCES games(id)
+    );
+    """,
+]
+
+# Запити (параметризовані, sqlite3 кешує їх як підготовлені вирази)
+SQL_GET_USER = 'SELECT username, password, avatar, start_balance, balance FROM users WHERE username = ?'
+SQL_LIST_USERS = 'SELECT username, password, avatar, start_balance, balance FROM users ORDER BY username'
+SQL_INSERT_USER = ('INSERT OR IGNORE INTO users (username, password, avatar, start_balance, balance) '
+                   'VALUES (?, ?, ?, ?, ?)')
+SQL_SET_PASSWORD = 'UPDATE users SET password = ? WHERE username = ?'
+SQL_GET_BALANCE = 'SELECT balance FROM users WHERE username = ?'
+SQL_ADD_BALANCE = 'UPDATE users SET balance = balance + ? WHERE username = ?'
+SQL_CHARGE = 'UPDATE users SET balance = balance - ? WHERE username = ? AND balance >= ?'
+SQL_RESET_BALANCE = 'UPDATE users SET balance = start_balance WHERE username = ?'
+SQL_GAMES = ('SELECT id, title, description, image, original_price, discount, current_price '
+             'FROM games ORDER BY id')
+SQL_GAME = ('SELECT id, title, description, image, original_price, discount, current_price '
+            'FROM games WHERE id = ?')
+SQL_TAGS = 'SELECT game_id, tag FROM game_tags ORDER BY game_id, position'
+SQL_GAME_TAGS = 'SELECT tag FROM game_tags WHERE game_id = ? ORDER BY position'
+SQL_IDS_WITH_TAG = 'SELECT game_id FROM game_tags WHERE tag = ? ORDER BY game_id'
+SQL_INSERT_GAME = ('INSERT INTO games '
+                   '(id, title, description, image, original_price, discount, current_price) '
+                   'VALUES (?, ?, ?, ?, ?, ?, ?) '
+                   'ON CONFLICT(id) DO UPDATE SET title = excluded.title, '
+                   'description = excluded.description, image = excluded.image, '
+                   'original_price = excluded.original_price, discount = excluded.discount, '
+                   'current_price = excluded.current_price')
+SQL_UPDATE_PRICE = ('UPDATE games SET original_price = COALESCE(?, original_price), '
+                    'discount = COALESCE(?, discount), current_price = COALESCE(?, current_price) '
+                    'WHERE id = ?')
+SQL_DELETE_GAME_TAGS = 'DELETE FROM game_tags WHERE game_id = ?'
+SQL_INSERT_TAG = 'INSERT INTO game_tags (game_id, position, tag) VALUES (?, ?, ?)'
+SQL_PURCHASED_IDS = 'SELECT game_id FROM purchases WHERE username = ? ORDER BY rowid'
+SQL_INSERT_PURCHASE = 'INSERT OR IGNORE INTO purchases (username, game_id, price) VALUES (?, ?, ?)'
+SQL_DELETE_PURCHASES = 'DELETE FROM purchases WHERE username = ?'
+SQL_COUNT_GAMES = 'SELECT COUNT(*) FROM games'
+SQL_SALES = 'SELECT id, name, discount, starts, ends, tag, game_ids FROM sales WHERE ends > ? ORDER BY id'
+SQL_INSERT_SALE = ('INSERT INTO sales (name, discount, starts, ends, tag, game_ids) '
+                   'VALUES (?, ?, ?, ?, ?, ?)')
+SQL_DELETE_SALE = 'DELETE FROM sales WHERE id = ?'
+SQL_LOG_PRICE_CHANGE = 'INSERT INTO price_changes (game_id) VALUES (?)'
+SQL_LAST_PRICE_CHANGE = 'SELECT COALESCE(MAX(id), 0) FROM price_changes'
+SQL_PRICE_CHANGES = ('SELECT price_changes.id, games.id AS game_id, games.original_price, '
+                     'games.discount, games.current_price '
+                     'FROM price_changes JOIN games ON games.id = price_changes.game_id '
+                     'WHERE price_changes.id > ? ORDER BY price_changes.id')
+
+# Результат покупки: успіх, сума, баланс після операції, куплені id та
+# status - причина результату (одна з констант CHECKOUT_*)
+CheckoutResult = namedtuple('CheckoutResult', ['ok', 'total', 'balance', 'game_ids', 'status'])
+
+CHECKOUT_OK = 'ok'
+CHECKOUT_NO_USER = 'no_user'                # користувача немає в базі
+CHECKOUT_ALREADY_OWNED = 'already_owned'    # всі ігри вже куплені
+CHECKOUT_NO_FUNDS = 'insufficient_funds'    # не вистачає балансу
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                           check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA foreign_keys=ON')
+    return conn
+
+
+class ConnectionPool:
+    """Пул з'єднань SQLite (з'єднання видається одному потоку за раз)"""
+
+    def __init__(self, path, size=5):
+        self.path = path
+        self.size = size
+        self._pool = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return _connect(self.path)
+        return self._pool.get()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self._created = 0
+
+
+class Storage:
+    """Доступ до даних магазину: користувачі, ігри, покупки"""
+
+    def __init__(self, path='steam.db', pool_size=5):
+        self.pool = ConnectionPool(path, pool_size)
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """Транзакція на одному з'єднанні пулу (immediate - одразу блокування на запис)"""
+        with self.pool.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    # --- Схема та початкові дані ---
+
+    def migrate(self):
+        """Застосувати міграції, яких ще немає в базі"""
+        with self.pool.connection() as conn:
+            # IMMEDIATE - щоб кілька процесів не мігрували одночасно
+            conn.execute('BEGIN IMMEDIATE')
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            for script in MIGRATIONS[version:]:
+                for statement in script.split(';'):
+                    if statement.strip():
+                        conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {len(MIGRATIONS)}')
+            conn.commit()
+
+    def seed(self, users, games):
+        """Імпортувати початкових користувачів та ігри (лише в порожню базу)"""
+        with self.transaction(immediate=True) as conn:
+            for username, data in users.items():
+                conn.execute(SQL_INSERT_USER, (username, data['password'], data['avatar'],
+                                               data['balance'], data['balance']))
+            if conn.execute(SQL_COUNT_GAMES).fetchone()[0] == 0:
+                self._insert_games(conn, games)
+
+    def save_games(self, games):
+        """Додати або оновити ігри"""
+        with self.transaction() as conn:
+            self._insert_games(conn, games)
+
+    def _insert_games(self, conn, games):
+        games = list(games)
+        conn.executemany(SQL_INSERT_GAME, (
+            (g['id'], g['title'], g['description'], g['image'],
+             g['original_price'], g['discount'], g['current_price'])
+            for g in games
+        ))
+        conn.executemany(SQL_DELETE_GAME_TAGS, ((game['id'],) for game in games))
+        conn.executemany(SQL_INSERT_TAG, (
+            (game['id'], position, tag)
+            for game in games for position, tag in enumerate(game['tags'])
+        ))
+
+    # --- Користувачі ---
+
+    def get_user(self, username):
+        """Дані користувача (або None)"""
+        with self.pool.connection() as conn:
+            row = conn.execute(SQL_GET_USER, (username,)).fetchone()
+        return dict(row) if row else None
+
+    def list_users(self):
+        with self.pool.connection() as conn:
+            return [dict(row) for row in conn.execute(SQL_LIST_USERS)]
+
+    def save_users(self, users):
+        """Додати користувачів: пари (логін, {password, avatar, balance})"""
+        with self.transaction() as conn:
+            conn.executemany(SQL_INSERT_USER, (
+                (username, data['password'], data['avatar'], data['balance'], data['balance'])
+                for username, data in users
+            ))
+
+    def upgrade_passwords(self, hash_password, is_hashed):
+        """Замінити паролі, збережені відкритим текстом, на хеші"""
+        with self.transaction(immediate=True) as conn:
+            # Попередній фільтр у SQL: у великій базі майже всі паролі вже хеші
+            rows = conn.execute(
+                "SELECT username, password FROM users WHERE password NOT LIKE 'pbkdf2%'"
+            ).fetchall()
+            for username, password in rows:
+                if not is_hashed(password):
+                    conn.execute(SQL_SET_PASSWORD, (hash_password(password), username))
+
+    def get_balance(self, username):
+        with self.pool.connection() as conn:
+            row = conn.execute(SQL_GET_BALANCE, (username,)).fetchone()
+        return row[0] if row else 0
+
+    def add_balance(self, username, amount):
+        with self.transaction() as conn:
+            conn.execute(SQL_ADD_BALANCE, (amount, username))
+
+    def reset_user(self, username):
+        """Повернути стартовий баланс та очистити бібліотеку"""
+        with self.transaction() as conn:
+            conn.execute(SQL_RESET_BALANCE, (username,))
+            conn.execute(SQL_DELETE_PURCHASES, (username,))
+
+    # --- Ігри ---
+
+    def load_games(self):
+        """Всі ігри з тегами (впорядковані за id)"""
+        with self.pool.connection() as conn:
+            games = [dict(row, tags=[]) for row in conn.execute(SQL_GAMES)]
+            by_id = {game['id']: game for game in games}
+            for game_id, tag in conn.execute(SQL_TAGS):
+                by_id[game_id]['tags'].append(tag)
+        return games
+
+    def get_game(self, game_id):
+        with self.pool.connection() as conn:
+            row = conn.execute(SQL_GAME, (game_id,)).fetchone()
+            if row is None:
+                return None
+            tags = [tag for (tag,) in conn.execute(SQL_GAME_TAGS, (game_id,))]
+        return dict(row, tags=tags)
+
+    def update_price(self, game_id, original_price=None, discount=None, current_price=None):
+        """Змінити ціну або знижку гри (None - не змінювати)
+
+        Зміна записується в журнал price_changes, звідки її підхоплюють
+        рушії цін усіх процесів (PricingEngine.refresh).
+        """
+        with self.transaction() as conn:
+            conn.execute(SQL_UPDATE_PRICE, (original_price, discount, current_price, game_id))
+            conn.execute(SQL_LOG_PRICE_CHANGE, (game_id,))
+
+    def last_price_change(self):
+        """id останнього запису журналу змін цін (0 - змін не було)"""
+        with self.pool.connection() as conn:
+            return conn.execute(SQL_LAST_PRICE_CHANGE).fetchone()[0]
+
+    def price_changes(self, after=0):
+        """Зміни цін після запису after: id запису та поточні ціни гри"""
+        with self.pool.connection() as conn:
+            return [dict(row) for row in conn.execute(SQL_PRICE_CHANGES, (after,))]
+
+    def ids_with_tag(self, tag):
+        with self.pool.connection() as conn:
+            return [game_id for (game_id,) in conn.execute(SQL_IDS_WITH_TAG, (tag,))]
+
+    # --- Розпродажі ---
+
+    def list_sales(self, after=0):
+        """Розпродажі, що закінчуються після after (game_ids - tuple або None)"""
+        with self.pool.connection() as conn:
+            rows = conn.execute(SQL_SALES, (after,)).fetchall()
+        return [dict(row, game_ids=tuple(int(i) for i in row['game_ids'].split(','))
+                     if row['game_ids'] else None) for row in rows]
+
+    def add_sale(self, name, discount, starts, ends, tag=None, game_ids=None):
+        """Додати розпродаж; повертає його id"""
+        ids = ','.join(str(game_id) for game_id in game_ids) if game_ids else None
+        with self.transaction() as conn:
+            return conn.execute(SQL_INSERT_SALE, (name, discount, starts, ends, tag, ids)).lastrowid
+
+    def delete_sale(self, sale_id):
+        with self.transaction() as conn:
+            conn.execute(SQL_DELETE_SALE, (sale_id,))
+
+    # --- Покупки ---
+
+    def get_purchased_ids(self, username):
+        with self.pool.connection() as conn:
+            return [game_id for (game_id,) in conn.execute(SQL_PURCHASED_IDS, (username,))]
+
+    def add_purchases(self, purchases):
+        """Записати покупки без списання балансу: трійки (логін, id гри, ціна)"""
+        with self.transaction() as conn:
+            conn.executemany(SQL_INSERT_PURCHASE, purchases)
+
+    def checkout(self, username, game_ids, prices=None):
+        """Атомарна покупка ігор з кошика
+
+        Вся операція виконується в транзакції BEGIN IMMEDIATE: SQLite бере
+        блокування на запис одразу, тому два одночасні checkout (з різних
+        потоків чи процесів) виконуються по черзі і не можуть обидва пройти
+        перевірку балансу. Ціни беруться з prices ({id: ціна} від рушія цін)
+        або з бази, вже куплені ігри пропускаються.
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        with self.pool.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = self._checkout(conn, username, game_ids, prices)
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        return result
+
+    def _checkout(self, conn, username, game_ids, known_prices=None):
+        row = conn.execute(SQL_GET_BALANCE, (username,)).fetchone()
+        if row is None:
+            return CheckoutResult(False, 0, 0, [], CHECKOUT_NO_USER)
+        balance = row[0]
+
+        owned = {game_id for (game_id,) in conn.execute(SQL_PURCHASED_IDS, (username,))}
+        to_buy = [game_id for game_id in game_ids if game_id not in owned]
+        if not to_buy:
+            return CheckoutResult(False, 0, balance, [], CHECKOUT_ALREADY_OWNED)
+
+        placeholders = ', '.join('?' * len(to_buy))
+        prices = dict(conn.execute(
+            f'SELECT id, current_price FROM games WHERE id IN ({placeholders})', to_buy
+        ).fetchall())
+        if known_prices:
+            # Гра має існувати в базі; ціна - актуальна, з урахуванням розпродажів
+            prices = {game_id: known_prices.get(game_id, price) for game_id, price in prices.items()}
+        to_buy = [game_id for game_id in to_buy if game_id in prices]
+        total = sum(prices[game_id] for game_id in to_buy)
+
+        # Списання з перевіркою балансу в одному UPDATE (compare-and-swap)
+        updated = conn.execute(SQL_CHARGE, (total, username, total)).rowcount
+        if not updated:
+            return CheckoutResult(False, total, balance, [], CHECKOUT_NO_FUNDS)
+
+        conn.executemany(SQL_INSERT_PURCHASE, (
+            (username, game_id, prices[game_id]) for game_id in to_buy
+        ))
+        return CheckoutResult(True, total, balance - total, to_buy, CHECKOUT_OK)
@@ -0,0 +1,49 @@
+"""Обидві вітрини в одному процесі: steam_clone на / і test_html на /test_html
+
+Запуск (розробка): python storefronts.py
+Production:        STEAM_STOREFRONTS=all python serve.py   (або gunicorn wsgi:app)
+
+Вітрини - два Flask-застосунки з одного коду (app.create_app), різні
+лише налаштування оформлення. Оскільки база та інші SERVICE_SETTINGS
+однакові, вони ділять пул з'єднань, каталог, пошук, ціни, сесії та
+скомпільовані шаблони (див. app.get_services).
+"""
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+
+from app import create_app
+
+# Налаштування кожної вітрини (перекривають config.Config)
+STEAM_CLONE = {}
+
+TEST_HTML = {
+    'STOREFRONT': 'test_html',
+    'AVATARS': {
+        'user1': 'https://avatars.steamstatic.com/b5bd56c1aa4644a474a2e4972be27534804bf7fa_full.jpg',
+        'gamer': 'https://avatars.steamstatic.com/c5d56249ee5d28a07db4ac9f7f60924714d2cade_full.jpg',
+    },
+    'LOGO_TEXT': '🎮',
+    'LOGIN_QR_URL': ('https://steamuserimages-a.akamaihd.net/ugc/941683446260934998/'
+                     '4FD177BC1B5BAC48B5CF434192D6B11F9591220D/?imw=512&imh=512&ima=fit'
+                     '&impolicy=Letterbox&imcolor=%23000000&letterbox=true'),
+    # Окремий cookie - вхід в одну вітрину не логінить в іншу
+    'SESSION_COOKIE_NAME': 'test_html_session',
+}
+
+# Префікс URL -> налаштування вітрини ('' - корінь)
+STOREFRONTS = {
+    '': STEAM_CLONE,
+    '/test_html': TEST_HTML,
+}
+
+
+def create_dispatcher(storefronts=None, config=None):
+    """WSGI-застосунок з усіма вітринами (config - спільні налаштування)"""
+    apps = {prefix: create_app(dict(config or {}, **settings))
+            for prefix, settings in (storefronts or STOREFRONTS).items()}
+    root = apps.pop('')
+    return DispatcherMiddleware(root, apps)
+
+
+if __name__ == '__main__':
+    from werkzeug.serving import run_simple
+    run_simple('127.0.0.1', 5000, create_dispatcher(), use_reloader=True, threaded=True)
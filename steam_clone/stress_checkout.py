@@ -0,0 +1,110 @@
+"""Стрес-тест атомарного checkout
+
+Запуск: python stress_checkout.py [--threads 8] [--processes 4] [--attempts 200]
+
+Кілька процесів, у кожному кілька потоків, одночасно купують випадкові
+ігри одного користувача. Після завершення перевіряється, що баланс не
+пішов у мінус, жодна гра не куплена двічі, а списана сума дорівнює сумі
+цін куплених ігор (немає втрачених оновлень).
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+
+from storage import Storage
+
+USERNAME = 'stress'
+START_BALANCE = 100000
+
+
+def make_games(count):
+    return [{
+        'id': game_id,
+        'title': f'Game {game_id}',
+        'description': '',
+        'image': '',
+        'tags': [],
+        'original_price': 100 + game_id,
+        'discount': 0,
+        'current_price': 100 + game_id,
+    } for game_id in range(1, count + 1)]
+
+
+def worker(path, threads, attempts, game_count, seed):
+    """Один процес: кілька потоків, кожен робить серію покупок"""
+    storage = Storage(path, pool_size=threads)
+    counters = {'ok': 0, 'rejected': 0}
+    lock = threading.Lock()
+
+    def run(thread_seed):
+        rnd = random.Random(thread_seed)
+        for _ in range(attempts):
+            cart = rnd.sample(range(1, game_count + 1), rnd.randint(1, 5))
+            result = storage.checkout(USERNAME, cart)
+            with lock:
+                counters['ok' if result.ok else 'rejected'] += 1
+
+    pool = [threading.Thread(target=run, args=(seed * 1000 + i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    storage.pool.close()
+    return counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent checkout stress test')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--attempts', type=int, default=200)
+    parser.add_argument('--games', type=int, default=500)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'stress.db')
+    storage = Storage(path)
+    storage.migrate()
+    users = {USERNAME: {'password': '', 'avatar': '', 'balance': START_BALANCE}}
+    storage.seed(users, make_games(args.games))
+
+    started = time.perf_counter()
+    with multiprocessing.Pool(args.processes) as pool:
+        results = pool.starmap(worker, [
+            (path, args.threads, args.attempts, args.games, seed)
+            for seed in range(args.processes)
+        ])
+    elapsed = time.perf_counter() - started
+
+    ok = sum(r['ok'] for r in results)
+    rejected = sum(r['rejected'] for r in results)
+    total = ok + rejected
+
+    balance = storage.get_balance(USERNAME)
+    with storage.pool.connection() as conn:
+        spent, rows, distinct = conn.execute(
+            'SELECT COALESCE(SUM(price), 0), COUNT(*), COUNT(DISTINCT game_id) '
+            'FROM purchases WHERE username = ?', (USERNAME,)
+        ).fetchone()
+
+    print(f'Checkouts: {total} ({ok} ok, {rejected} rejected) in {elapsed:.2f} s '
+          f'= {total / elapsed:.0f} checkouts/s')
+    print(f'Balance: {START_BALANCE} -> {balance}, spent {spent}, games bought {rows}')
+
+    errors = []
+    if balance < 0:
+        errors.append('balance went negative')
+    if rows != distinct:
+        errors.append('game purchased twice')
+    if START_BALANCE - balance != spent:
+        errors.append('lost update: charged amount differs from purchases')
+    if errors:
+        raise SystemExit('FAILED: ' + ', '.join(errors))
+    print('OK: no double spending, no lost updates')
+
+
+if __name__ == '__main__':
+    main()
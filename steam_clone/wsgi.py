@@ -0,0 +1,11 @@
+# Точка входу для production WSGI-серверів: gunicorn -c gunicorn.conf.py wsgi:app
+# STEAM_STOREFRONTS=all - обидві вітрини (steam_clone на /, test_html на /test_html)
+import os
+
+from app import create_app
+from storefronts import create_dispatcher
+
+if os.environ.get('STEAM_STOREFRONTS') == 'all':
+    app = create_dispatcher()
+else:
+    app = create_app()